@@ -0,0 +1,293 @@
+"""Headless benchmarks of ``app.py`` with Streamlit's AppTest.
+
+For every deck size the runner builds a synthetic store, precomputes its
+search and fuzzy indexes, similarity table and question banks, and then
+runs each scenario in a fresh worker process pointed at it through
+``GRE_VOCAB_STORE``, so no scenario's timings or memory depend on the ones
+before it. A worker drives the app through one navigation mode or scripted
+journey, timing every rerun and sampling RSS, and prints its results as
+JSON.
+
+Results are compared against the committed ``benchmarks/baseline.json``; any
+scenario whose median rerun time or RSS grew by more than ``--threshold`` is
+reported as a regression and the exit status is 1, as it is when the
+baseline is missing::
+
+    python -m benchmarks.app_bench                       # 1k, 10k, 100k words
+    python -m benchmarks.app_bench --sizes 1000 --update-baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+BASELINE_PATH = os.path.join(BASE_DIR, "benchmarks", "baseline.json")
+SIZES = (1_000, 10_000, 100_000)
+THRESHOLD = 0.25
+MODES = {
+    "dashboard": "🏠 Dashboard",
+    "study": "📖 Study Mode",
+    "test": "🧪 Test Yourself",
+    "games": "🎮 Games",
+    "progress": "📊 Progress Report",
+    "settings": "⚙️ Settings",
+}
+IDLE_RERUNS = 5
+
+
+def rss_mb():
+    """Current resident set size of this process, in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Journey:
+    """A fresh app session that times each rerun it triggers."""
+
+    def __init__(self, user):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP_PATH, default_timeout=600)
+        self.at.query_params["user"] = user
+        self.samples = []
+        self.step()
+
+    def step(self, widget=None):
+        start = time.perf_counter()
+        (widget or self.at).run()
+        self.samples.append((time.perf_counter() - start) * 1000)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].value)
+
+    def navigate(self, mode):
+        self.step(self.at.sidebar.selectbox[0].select(mode))
+
+    def button(self, label):
+        # After a fragment rerun that renders fewer elements, AppTest keeps the
+        # fragment's stale elements after the fresh ones, sharing their widget
+        # ids; the last match is the one whose click state is sent. An exact
+        # label wins over one that merely contains it ("▶️ Play Pronunciation").
+        exact = [b for b in self.at.button if b.label == label]
+        return (exact or [b for b in self.at.button if label in b.label])[-1]
+
+
+def flashcards_50(journey):
+    journey.navigate(MODES["study"])
+    # AppTest cannot drive the browser deck component; time the button deck
+    journey.step(journey.at.toggle(key="client_deck").set_value(False))
+    for _ in range(50):
+        journey.step(journey.button("▶️").click())
+
+
+def mixed_test_30(journey):
+    at = journey.at
+    journey.navigate(MODES["test"])
+    journey.step(next(s for s in at.selectbox if s.label == "Test Type:").select("Mixed Questions"))
+    journey.step(at.slider[0].set_value(30))
+    journey.step(journey.button("Start Test").click())
+    for _ in range(30):
+        journey.step(journey.button("Submit Answer").click())
+    if not any("Test Completed" in str(m.value) for m in at.markdown):
+        raise RuntimeError("test did not finish after 30 answers")
+
+
+def one_page_test_30(journey):
+    at = journey.at
+    journey.navigate(MODES["test"])
+    journey.step(next(s for s in at.selectbox if s.label == "Test Type:").select("Mixed Questions"))
+    journey.step(at.slider[0].set_value(30))
+    journey.step(at.toggle(key="one_page_test").set_value(True))
+    journey.step(journey.button("Start Test").click())
+    for radio in at.radio:
+        if radio.key and radio.key.startswith("form_q_"):
+            radio.set_value(radio.options[0])
+    journey.step(journey.button("Submit Test").click())
+    if not any("Test Completed" in str(m.value) for m in at.markdown):
+        raise RuntimeError("one-page test did not finish")
+
+
+def deck_test_200(journey):
+    at = journey.at
+    journey.navigate(MODES["test"])
+    journey.step(at.radio(key="test_scope").set_value("Whole deck"))
+    journey.step(at.slider[0].set_value(200))
+    journey.step(at.toggle(key="one_page_test").set_value(True))
+    journey.step(journey.button("Start Test").click())
+    journey.step(journey.button("Submit Test").click())
+    if not any("Test Completed" in str(m.value) for m in at.markdown):
+        raise RuntimeError("whole-deck test did not finish")
+
+
+def word_match(journey):
+    at = journey.at
+    journey.navigate(MODES["games"])
+    journey.step(journey.button("Start Matching Game").click())
+    for box in [s for s in at.selectbox if s.label.startswith("Match for")]:
+        journey.step(box.select(box.options[1]))
+    journey.step(journey.button("Check Matches").click())
+
+
+def idle_mode(mode):
+    def run(journey):
+        journey.navigate(mode)
+        for _ in range(IDLE_RERUNS):
+            journey.step()
+    return run
+
+
+def scenarios():
+    for slug, mode in MODES.items():
+        yield f"mode:{slug}", idle_mode(mode)
+    yield "journey:flashcards_50", flashcards_50
+    yield "journey:mixed_test_30", mixed_test_30
+    yield "journey:one_page_test_30", one_page_test_30
+    yield "journey:deck_test_200", deck_test_200
+    yield "journey:word_match", word_match
+
+
+def summarize(samples, rss_before, rss_after):
+    ordered = sorted(samples)
+    return {
+        "reruns": len(ordered),
+        "p50_ms": statistics.median(ordered),
+        "p95_ms": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+        "max_ms": ordered[-1],
+        "rss_mb": rss_after,
+        "rss_delta_mb": rss_after - rss_before,
+    }
+
+
+def run_worker(name):
+    """Run scenario ``name`` in this process and print its results as JSON."""
+    sys.path.insert(0, BASE_DIR)  # AppTest does not put the script's directory on sys.path
+    scenario = dict(scenarios())[name]
+    rss_before = rss_mb()
+    journey = Journey("bench")
+    scenario(journey)
+    # The first rerun of a session includes one-off setup; report it on its own
+    results = summarize(journey.samples[1:], rss_before, rss_mb())
+    results["first_run_ms"] = journey.samples[0]
+    print(json.dumps(results))
+
+
+def run_size(n_words, workdir):
+    from benchmarks.synthetic import synthetic_vocab
+    from core.store import build_store
+
+    store_path = os.path.join(workdir, f"vocab_{n_words}.bin")
+    build_store(synthetic_vocab(n_words), store_path)
+    env = dict(
+        os.environ,
+        GRE_VOCAB_STORE=store_path,
+        GRE_VOCAB_DB=os.path.join(workdir, f"progress_{n_words}.db"),
+        GRE_SIMILARITY_PATH=os.path.join(workdir, f"similarity_{n_words}.npz"),
+        GRE_SEARCH_PATH=os.path.join(workdir, f"search_index_{n_words}.npz"),
+        GRE_FUZZY_PATH=os.path.join(workdir, f"fuzzy_index_{n_words}.npz"),
+        GRE_QUESTION_BANK_PATH=os.path.join(workdir, f"question_bank_{n_words}.npz"),
+        PYTHONPATH=BASE_DIR,
+    )
+    env.pop("GRE_PROFILE", None)
+
+    def run(*args):
+        proc = subprocess.run([sys.executable, "-m", *args], cwd=BASE_DIR, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{' '.join(args)} for {n_words} words failed:\n{proc.stderr}")
+        return proc.stdout
+
+    # Precompute the lookup indexes, similarity table and banks so no scenario pays for them
+    run("core.search")
+    run("core.fuzzy")
+    run("core.bank")
+    results = {}
+    for name, _ in scenarios():
+        # One process per scenario: each starts from the same cold state
+        results[name] = json.loads(run("benchmarks.app_bench", "--worker", name).strip().splitlines()[-1])
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return ``(size, scenario, metric, old, new)`` for every regression."""
+    regressions = []
+    for size, scenarios_ in results.items():
+        for name, metrics in scenarios_.items():
+            old = baseline.get(size, {}).get(name)
+            if old is None:
+                continue
+            for metric in ("p50_ms", "rss_mb"):
+                if old[metric] > 0 and metrics[metric] > old[metric] * (1 + threshold):
+                    regressions.append((size, name, metric, old[metric], metrics[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app.py reruns headlessly with AppTest.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="synthetic deck sizes (words)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed relative slowdown")
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    parser.add_argument("--worker", metavar="SCENARIO", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.worker)
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="gre_bench_") as workdir:
+        for n_words in args.sizes:
+            start = time.perf_counter()
+            results[str(n_words)] = run_size(n_words, workdir)
+            print(f"{n_words:>7} words  ({time.perf_counter() - start:.0f}s)")
+            for name, m in results[str(n_words)].items():
+                print(f"    {name:<24} p50 {m['p50_ms']:8.1f} ms  p95 {m['p95_ms']:8.1f} ms  "
+                      f"first {m['first_run_ms']:8.1f} ms  rss {m['rss_mb']:7.1f} MB")
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote baseline {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    except OSError:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 1
+
+    regressions = compare(results, baseline, args.threshold)
+    for size, name, metric, old, new in regressions:
+        print(f"REGRESSION {size} words {name} {metric}: {old:.1f} -> {new:.1f} (+{(new / old - 1) * 100:.0f}%)")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
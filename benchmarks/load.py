@@ -0,0 +1,339 @@
+"""Multi-session load test against a locally started Streamlit server.
+
+Starts ``streamlit run app.py`` on a synthetic deck and opens ``--sessions``
+concurrent websocket sessions that speak Streamlit's own protocol (the
+``BackMsg``/``ForwardMsg`` protobufs the browser sends and receives). Each
+session follows a realistic script: open the Dashboard, flip through
+flashcards (sending the browser deck's batched syncs, or clicking through
+the server-side deck with ``--button-deck``), take a Mixed test (one
+question per rerun, or as one form with ``--one-page-test``), then look at
+the Progress Report.
+
+An action's latency runs from sending its rerun request to the server's
+``script_finished`` for that run; reruns the app triggers itself with
+``st.rerun()`` count towards the action that caused them. The report gives
+throughput, latency percentiles and bytes received per action, and the
+server's RSS growth per connected session::
+
+    python -m benchmarks.load --sessions 50 --words 10000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+
+from benchmarks.app_bench import BASE_DIR, MODES
+
+APP_PATH = os.path.join(BASE_DIR, "app.py")
+FORM_FIELD = re.compile(r"-form_q_\d+$")  # keyed widgets of the one-page test form
+DONE = {"FINISHED_SUCCESSFULLY", "FINISHED_FRAGMENT_RUN_SUCCESSFULLY"}
+
+
+def process_rss_mb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class Session:
+    """One simulated browser tab: tracks the widgets on screen and their values."""
+
+    def __init__(self, url, user):
+        self.url = url
+        self.user = user
+        self.ws = None
+        self.widgets = {}  # label -> (widget id, kind, fragment id, options), latest render wins
+        self.form_fields = {}  # widget id -> kind, for the one-page test form
+        self.values = {}  # widget id -> (kind, value) sent with every rerun
+        self.texts = []
+        self.messages = {}  # hash -> ForwardMsg, like the browser's message cache
+        self.latencies = []  # (action, ms, bytes received)
+        self.errors = 0
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, max_message_size=64 * 2**20)
+        await self.rerun("load", query_string=f"user={self.user}")
+
+    async def rerun(self, action, trigger=None, fragment_id="", query_string=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        state.query_string = query_string or f"user={self.user}"
+        if fragment_id:
+            state.fragment_id = fragment_id
+        for widget_id, (kind, value) in self.values.items():
+            ws = state.widget_states.widgets.add()
+            ws.id = widget_id
+            setattr(ws, kind, value)
+        if trigger is not None:
+            ws = state.widget_states.widgets.add()
+            ws.id = trigger
+            ws.trigger_value = True
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        self.texts = []
+        received = 0
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                raise ConnectionError("server closed the session")
+            received += len(data)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            kind = fwd.WhichOneof("type")
+            if kind == "ref_hash":
+                # A message this session has already received, sent by hash
+                fwd = self.messages[fwd.ref_hash]
+                kind = fwd.WhichOneof("type")
+            elif fwd.hash:
+                self.messages[fwd.hash] = fwd
+            if kind == "delta":
+                self._on_delta(fwd.delta)
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(fwd.script_finished)
+                if status in DONE:
+                    break
+        self.latencies.append((action, (time.perf_counter() - start) * 1000, received))
+
+    def _on_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "markdown":
+            self.texts.append(element.markdown.body)
+        elif kind in ("button", "selectbox", "radio", "text_input", "slider", "checkbox"):
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = (widget.id, kind, delta.fragment_id, list(getattr(widget, "options", ())))
+            if FORM_FIELD.search(widget.id):
+                self.form_fields[widget.id] = kind
+        elif kind == "component_instance":
+            # Custom components have no label; their arguments stand in for options
+            component = element.component_instance
+            self.widgets[component.component_name] = (
+                component.id, kind, delta.fragment_id, json.loads(component.json_args)
+            )
+
+    def find(self, label):
+        if label in self.widgets:
+            return self.widgets[label]
+        for widget_label, widget in self.widgets.items():
+            if label in widget_label:
+                return widget
+        raise LookupError(f"no widget labelled {label!r} on screen")
+
+    async def select(self, action, label, option):
+        widget_id, _, fragment_id, options = self.find(label)
+        self.values[widget_id] = ("int_value", options.index(option))
+        await self.rerun(action, fragment_id=fragment_id)
+
+    async def click(self, action, label):
+        widget_id, _, fragment_id, _ = self.find(label)
+        await self.rerun(action, trigger=widget_id, fragment_id=fragment_id)
+
+    async def toggle(self, action, label, value):
+        widget_id, _, fragment_id, _ = self.find(label)
+        self.values[widget_id] = ("bool_value", value)
+        await self.rerun(action, fragment_id=fragment_id)
+
+    async def browse(self, cards):
+        """Page through ``cards`` cards of the browser deck, sending its batches."""
+        widget_id, _, fragment_id, args = self.find("flashcard_deck")
+        mount = uuid.uuid4().hex
+        index = args["start"]
+        for seq, first in enumerate(range(0, cards, args["batch_events"]), 1):
+            index += min(args["batch_events"], cards - first)
+            batch = {
+                "mount": mount, "seq": seq, "group": args["group"], "index": index, "showing": False,
+                "reached": index,
+            }
+            self.values[widget_id] = ("json_value", json.dumps(batch))
+            await self.rerun("deck_sync", fragment_id=fragment_id)
+
+    async def submit_form(self):
+        """Answer every question of the one-page test form and submit it once."""
+        for widget_id, kind in self.form_fields.items():
+            self.values[widget_id] = ("string_value", "") if kind == "text_input" else ("int_value", 0)
+        await self.click("submit_test", "Submit Test")
+
+    async def script(self, cards, questions, button_deck=False, one_page=False):
+        """The navigation and test-taking journey every session runs."""
+        await self.select("navigate", "Navigate to:", MODES["study"])
+        if button_deck:
+            await self.toggle("configure", "Instant cards", False)
+            for _ in range(cards):
+                await self.click("flashcard", "▶️")
+        else:
+            await self.browse(cards)
+        await self.select("navigate", "Navigate to:", MODES["test"])
+        await self.select("configure", "Test Type:", "Mixed Questions")
+        if one_page:
+            await self.toggle("configure", "Whole test on one page", True)
+        await self.click("start_test", "Start Test")
+        if one_page:
+            await self.submit_form()
+        else:
+            for _ in range(questions):
+                await self.click("answer", "Submit Answer")
+                if any("Test Completed" in text for text in self.texts):
+                    break
+        await self.select("navigate", "Navigate to:", MODES["progress"])
+        await self.select("navigate", "Navigate to:", MODES["dashboard"])
+
+
+async def run_sessions(url, n_sessions, cards, questions, ramp, button_deck=False, one_page=False):
+    sessions = [Session(url, f"load-{i}-{int(time.time())}") for i in range(n_sessions)]
+
+    async def run(i, session):
+        await asyncio.sleep(ramp * i / max(1, n_sessions))
+        try:
+            await session.connect()
+            await session.script(cards, questions, button_deck, one_page)
+        except Exception as e:
+            session.errors += 1
+            print(f"session {i}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(i, s) for i, s in enumerate(sessions)))
+    return sessions, time.perf_counter() - start
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, env):
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--server.address", "127.0.0.1", "--browser.gatherUsageStats", "false"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError(f"server did not start:\n{proc.stderr.read().decode()}")
+
+
+def report(sessions, elapsed, rss_idle, rss_loaded, n_sessions):
+    by_action = {}
+    received = {}
+    for session in sessions:
+        for action, ms, nbytes in session.latencies:
+            by_action.setdefault(action, []).append(ms)
+            received.setdefault(action, []).append(nbytes)
+    everything = sorted(ms for samples in by_action.values() for ms in samples)
+    received["all"] = [n for samples in received.values() for n in samples]
+    summary = {
+        "sessions": n_sessions,
+        "errors": sum(s.errors for s in sessions),
+        "actions": len(everything),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(everything) / elapsed if elapsed else 0.0,
+        "latency_ms": {},
+        "server_rss_idle_mb": rss_idle,
+        "server_rss_loaded_mb": rss_loaded,
+        "server_rss_per_session_mb": (rss_loaded - rss_idle) / n_sessions if n_sessions else 0.0,
+    }
+    for action, samples in sorted(by_action.items()) + [("all", everything)]:
+        ordered = sorted(samples)
+        summary["latency_ms"][action] = {
+            "count": len(ordered),
+            "p50": statistics.median(ordered),
+            "p95": percentile(ordered, 0.95),
+            "p99": percentile(ordered, 0.99),
+            "max": ordered[-1],
+            "kb_mean": statistics.mean(received[action]) / 1024,
+        }
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the app with concurrent websocket sessions.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--words", type=int, default=10_000, help="synthetic deck size")
+    parser.add_argument("--store", help="serve this prebuilt store instead of a synthetic deck")
+    parser.add_argument("--cards", type=int, default=10, help="flashcards each session flips")
+    parser.add_argument("--button-deck", action="store_true",
+                        help="flip cards with the server-side buttons instead of the browser deck")
+    parser.add_argument("--questions", type=int, default=10, help="test answers each session submits")
+    parser.add_argument("--one-page-test", action="store_true",
+                        help="take the test as one form instead of question by question")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions connect")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--out", help="write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    from benchmarks.synthetic import synthetic_vocab, write_deck
+
+    with tempfile.TemporaryDirectory(prefix="gre_load_") as workdir:
+        store = args.store or write_deck(synthetic_vocab(args.words), os.path.join(workdir, "deck.bin"))
+        env = dict(
+            os.environ,
+            GRE_VOCAB_STORE=store,
+            GRE_VOCAB_DB=os.path.join(workdir, "progress.db"),
+            GRE_SIMILARITY_PATH=os.path.join(workdir, "similarity.npz"),
+            GRE_SEARCH_PATH=os.path.join(workdir, "search_index.npz"),
+            GRE_FUZZY_PATH=os.path.join(workdir, "fuzzy_index.npz"),
+            GRE_QUESTION_BANK_PATH=os.path.join(workdir, "question_bank.npz"),
+        )
+        port = args.port or free_port()
+        server = start_server(port, env)
+        try:
+            url = f"ws://127.0.0.1:{port}/_stcore/stream"
+            # One warm-up session loads the deck and the shared indexes, so the
+            # idle RSS below is the cost of the process rather than of sessions
+            asyncio.run(run_sessions(url, 1, 1, 1, 0))
+            rss_idle = process_rss_mb(server.pid)
+            sessions, elapsed = asyncio.run(run_sessions(
+                url, args.sessions, args.cards, args.questions, args.ramp, args.button_deck, args.one_page_test
+            ))
+            rss_loaded = process_rss_mb(server.pid)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    summary = report(sessions, elapsed, rss_idle, rss_loaded, args.sessions)
+    print(f"{summary['sessions']} sessions, {summary['actions']} actions in {summary['elapsed_s']:.1f}s "
+          f"({summary['throughput_rps']:.1f}/s), {summary['errors']} errors")
+    for action, lat in summary["latency_ms"].items():
+        print(f"    {action:<11} n={lat['count']:<5} p50 {lat['p50']:7.1f} ms  p95 {lat['p95']:7.1f} ms  "
+              f"p99 {lat['p99']:7.1f} ms  max {lat['max']:7.1f} ms  {lat['kb_mean']:6.1f} kB")
+    print(f"server RSS {rss_idle:.0f} MB idle -> {rss_loaded:.0f} MB loaded "
+          f"({summary['server_rss_per_session_mb']:.2f} MB/session)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Synthetic ``vocab_groups``-shaped decks for benchmarks and load tests.
+
+Decks can be written as a compiled store (serve it with ``GRE_VOCAB_STORE``)
+or as a Python module shaped like ``data/vocab_data.py``::
+
+    python -m benchmarks.synthetic --groups 1000 --words-per-group 30 --out /tmp/deck.bin
+    python -m benchmarks.synthetic --groups 40 --meaning-words 2 6 --out /tmp/vocab_data.py
+"""
+
+import argparse
+import random
+
+SYLLABLES = (
+    "ab", "ac", "al", "an", "ar", "ba", "ca", "co", "de", "di", "en", "er", "fa", "ga", "im", "in",
+    "la", "li", "lo", "ma", "mi", "mo", "na", "ob", "or", "pa", "pe", "po", "qu", "ra", "re", "ri",
+    "sa", "se", "so", "ta", "te", "ti", "to", "un", "va", "ve", "vi", "ze",
+)
+GLOSS_WORDS = (
+    "able", "bold", "calm", "clear", "cold", "dark", "deep", "dull", "eager", "fair", "false", "firm",
+    "free", "harsh", "humble", "idle", "keen", "kind", "loud", "mild", "open", "plain", "proud", "quick",
+    "quiet", "rare", "rigid", "rough", "sharp", "shy", "slow", "stern", "strict", "sweet", "timid",
+    "vague", "vast", "weak", "wild", "wise",
+)
+# Bengali consonants and vowel signs, for meanings that exercise the same
+# multi-byte UTF-8 paths as the real deck
+BENGALI_CONSONANTS = [chr(c) for c in range(0x0995, 0x09B9) if c not in (0x09A9, 0x09B1, 0x09B3, 0x09B4, 0x09B5)]
+BENGALI_SIGNS = ["", "া", "ি", "ী", "ু", "ে", "ো"]
+
+
+def _word(rng, index, width):
+    # Two random syllables plus the index written as a fixed-width run of
+    # syllables, so every word in a deck is distinct
+    parts = [rng.choice(SYLLABLES), rng.choice(SYLLABLES)]
+    for _ in range(width):
+        index, digit = divmod(index, len(SYLLABLES))
+        parts.append(SYLLABLES[digit])
+    return "".join(parts)
+
+
+def _gloss(rng, n_words):
+    return ", ".join(rng.choice(GLOSS_WORDS) for _ in range(n_words))
+
+
+def _bengali(rng, n_words):
+    words = []
+    for _ in range(n_words):
+        words.append("".join(
+            rng.choice(BENGALI_CONSONANTS) + rng.choice(BENGALI_SIGNS) for _ in range(rng.randint(2, 4))
+        ))
+    return " ".join(words)
+
+
+def synthetic_vocab(n_words, words_per_group=30, simple_words=(1, 4), meaning_words=(1, 4), seed=0):
+    """A deck of ``n_words`` made-up words in groups of ``words_per_group``.
+
+    Definitions have between ``simple_words`` / ``meaning_words`` (inclusive
+    ranges) words each. The same arguments always give the same deck.
+    """
+    rng = random.Random(seed)
+    width = 1
+    while len(SYLLABLES) ** width < n_words:
+        width += 1
+    vocab_groups = {}
+    for start in range(0, n_words, words_per_group):
+        vocab_groups[f"Group {start // words_per_group + 1}"] = [
+            {
+                "word": _word(rng, i, width),
+                "simple": _gloss(rng, rng.randint(*simple_words)),
+                "meaning": _bengali(rng, rng.randint(*meaning_words)),
+            }
+            for i in range(start, min(start + words_per_group, n_words))
+        ]
+    return vocab_groups
+
+
+def write_deck(vocab_groups, path):
+    """Write a compiled store, or a ``vocab_data.py``-style module for ``.py`` paths."""
+    if path.endswith(".py"):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("vocab_groups = {\n")
+            for group, words in vocab_groups.items():
+                f.write(f"    {group!r}: [\n")
+                for w in words:
+                    f.write(f"        {w!r},\n")
+                f.write("    ],\n")
+            f.write("}\n")
+        return path
+
+    from core.store import build_store
+
+    return build_store(vocab_groups, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic vocabulary deck.")
+    parser.add_argument("--groups", type=int, default=100)
+    parser.add_argument("--words-per-group", type=int, default=30)
+    parser.add_argument("--simple-words", type=int, nargs=2, default=(1, 4), metavar=("MIN", "MAX"),
+                        help="words per simple definition")
+    parser.add_argument("--meaning-words", type=int, nargs=2, default=(1, 4), metavar=("MIN", "MAX"),
+                        help="words per Bengali-like meaning")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="store file, or a .py module")
+    args = parser.parse_args()
+
+    deck = synthetic_vocab(args.groups * args.words_per_group, args.words_per_group,
+                           tuple(args.simple_words), tuple(args.meaning_words), args.seed)
+    out = write_deck(deck, args.out)
+    print(f"Wrote {out}: {len(deck)} groups, {args.groups * args.words_per_group} words")
@@ -0,0 +1,215 @@
+"""Precomputed question bank: test assembly by row lookup.
+
+For every word the bank holds ``VARIANTS`` ready-made question variants: a
+shuffled multiple-choice option set (with the slot of the correct answer)
+and a False definition for True/False statements. Distractors are drawn as
+:func:`core.questions.generate_tests` draws them for a single group. Each
+difficulty has its own bank, stored column-wise in
+``data/question_bank.<difficulty>.npz`` and built the first time that
+difficulty is asked for, so only Hard and Expert need the similarity table.
+
+Assembling a test then only samples word positions and variant numbers and
+gathers rows, so starting a test costs O(questions) whatever the group or
+deck size. Question text is still rendered from word ids when a question
+is shown.
+
+Run ``python -m core.bank`` to build the bank ahead of deployment; the app
+also builds it on first use if it is missing or out of date.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from core.questions import (
+    DIFFICULTIES, MULTIPLE_CHOICE, N_OPTIONS, SIMILAR_DIFFICULTIES, TEST_TYPES, TRUE_FALSE, TestBatch,
+    _draw_distractors, _sample_without_replacement,
+)
+from core.store import BASE_DIR
+
+BANK_PATH = os.environ.get("GRE_QUESTION_BANK_PATH", os.path.join(BASE_DIR, "data", "question_bank.npz"))
+VARIANTS = 4
+SEED = 0
+# Bumped whenever the way variants are drawn changes, so saved banks are rebuilt
+VERSION = 2
+
+
+def bank_path(difficulty, path=BANK_PATH):
+    """The file one difficulty's bank is kept in: ``question_bank.medium.npz`` etc."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{difficulty.lower()}{ext}"
+
+
+def _fingerprint(vocab_index, difficulty, neighbors, variants, seed):
+    h = hashlib.sha256(f"{VERSION}:{difficulty}:{variants}:{seed}:{N_OPTIONS}".encode())
+    h.update(np.asarray(vocab_index.group_offsets, dtype=np.int64).tobytes())
+    for w in vocab_index.records:
+        h.update(f"{w['word']}\0{w['simple']}\0{w['meaning']}\0".encode("utf-8"))
+    if neighbors is not None:
+        h.update(np.ascontiguousarray(neighbors).tobytes())
+    return np.frombuffer(h.digest(), dtype=np.uint8)
+
+
+class QuestionBank:
+    """``(n_words, variants, ...)`` arrays of question variants for one difficulty.
+
+    ``options`` holds option word ids, padded with ``-1`` on the right
+    when a group has too few distinct meanings; ``correct`` is the slot of
+    the word itself; ``tf_false`` is the word whose definition a False
+    statement shows, or ``-1`` if no different definition exists.
+    """
+
+    def __init__(self, difficulty, options, correct, tf_false):
+        self.difficulty = difficulty
+        self.options = options
+        self.correct = correct
+        self.tf_false = tf_false
+
+    @property
+    def variants(self):
+        return self.correct.shape[1]
+
+
+def build_bank(vocab_index, distractor_pool, difficulty, similarity=None, variants=VARIANTS, seed=SEED):
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"unknown difficulty {difficulty!r}")
+    rng = np.random.default_rng(seed)
+    n_words = vocab_index.total_words
+    neighbors = similarity.neighbors if similarity is not None else None
+    meanings = np.frombuffer(distractor_pool.value_ids("meaning"), dtype=np.uint32)
+    simples = np.frombuffer(distractor_pool.value_ids("simple"), dtype=np.uint32)
+    offsets = vocab_index.group_offsets
+    n_false = min(1, len(np.unique(simples)) - 1)
+
+    options = np.full((n_words, variants, N_OPTIONS), -1, dtype=np.int32)
+    correct = np.zeros((n_words, variants), dtype=np.int8)
+    tf_false = np.empty((n_words, variants), dtype=np.int32)
+    # Easy draws from the whole deck, so it needs no per-group pools
+    if difficulty == "Easy":
+        spans = [(0, n_words, max(0, min(N_OPTIONS - 1, len(np.unique(meanings)) - 1, n_words - 1)))]
+    else:
+        spans = [
+            (start, stop, max(0, min(N_OPTIONS - 1, len(np.unique(meanings[start:stop])) - 1, stop - start - 1)))
+            for start, stop in zip(offsets[:-1], offsets[1:])
+        ]
+    for start, stop, n_wrong in spans:
+        if start == stop:
+            continue
+        pool = np.arange(start, stop)
+        words = np.repeat(pool[:, None], variants, axis=1)
+        wrong = _draw_distractors(rng, words, n_wrong, meanings, pool, n_words, difficulty, neighbors)
+        shuffled = rng.permuted(np.concatenate([wrong, words[..., None]], axis=-1), axis=-1)
+        options[start:stop, :, :n_wrong + 1] = shuffled
+        correct[start:stop] = np.argmax(shuffled == words[..., None], axis=-1)
+        false = _draw_distractors(rng, words, n_false, simples, pool, n_words, difficulty, neighbors)
+        false = false[..., 0] if n_false else words
+        tf_false[start:stop] = np.where(simples[false] == simples[words], -1, false)
+    return QuestionBank(difficulty, options, correct, tf_false)
+
+
+def load_bank(vocab_index, distractor_pool, difficulty, similarity=None, path=BANK_PATH, variants=VARIANTS, seed=SEED):
+    """Load one difficulty's bank, rebuilding (and saving) it when stale.
+
+    ``similarity`` is only used, and only needed, for
+    :data:`SIMILAR_DIFFICULTIES`.
+    """
+    if difficulty not in SIMILAR_DIFFICULTIES:
+        similarity = None
+    path = bank_path(difficulty, path)
+    neighbors = similarity.neighbors if similarity is not None else None
+    fingerprint = _fingerprint(vocab_index, difficulty, neighbors, variants, seed)
+    try:
+        with np.load(path) as data:
+            if np.array_equal(data["fingerprint"], fingerprint):
+                return QuestionBank(difficulty, data["options"], data["correct"], data["tf_false"])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    bank = build_bank(vocab_index, distractor_pool, difficulty, similarity, variants, seed)
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, fingerprint=fingerprint, options=bank.options, correct=bank.correct, tf_false=bank.tf_false)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return bank
+
+
+def assemble_tests(bank, groups, test_type, n_questions, vocab_index, n_tests=1, seed=None):
+    """Like :func:`core.questions.generate_tests`, but every row comes from ``bank``.
+
+    Only the question words, their variant numbers and the True/False coin
+    flips are drawn, so the cost does not depend on how many words
+    ``groups`` hold.
+    """
+    if test_type not in TEST_TYPES:
+        raise ValueError(f"unknown test type {test_type!r}")
+    rng = np.random.default_rng(seed)
+
+    # Positions in the concatenation of the groups' id ranges, mapped back to ids
+    ranges = [vocab_index.group_range(g) for g in groups]
+    starts = np.array([r.start for r in ranges], dtype=np.int64)
+    ends = np.cumsum([len(r) for r in ranges], dtype=np.int64)
+    total = int(ends[-1]) if len(ends) else 0
+    pos = _sample_without_replacement(rng, total, n_tests, min(n_questions, total))
+    which = np.searchsorted(ends, pos, side="right")
+    firsts = np.concatenate([[0], ends[:-1]])
+    word_ids = (starts[which] + pos - firsts[which]).astype(np.int32)
+    return _assemble(bank, word_ids, test_type, rng)
+
+
+def assemble_test(bank, word_ids, test_type, seed=None):
+    """One test asking about ``word_ids``, in that order, with rows from ``bank``."""
+    if test_type not in TEST_TYPES:
+        raise ValueError(f"unknown test type {test_type!r}")
+    word_ids = np.asarray(word_ids, dtype=np.int32).reshape(1, -1)
+    return _assemble(bank, word_ids, test_type, np.random.default_rng(seed))
+
+
+def _assemble(bank, word_ids, test_type, rng):
+    if test_type == "Mixed Questions":
+        qtypes = rng.integers(0, 3, size=word_ids.shape).astype(np.int8)
+    else:
+        qtypes = np.full(word_ids.shape, TEST_TYPES.index(test_type), dtype=np.int8)
+    variant = rng.integers(0, bank.variants, size=word_ids.shape)
+
+    # Options stay padded with -1 per question; rendering skips the padding
+    is_mc = qtypes == MULTIPLE_CHOICE
+    options = np.where(is_mc[..., None], bank.options[word_ids, variant], -1).astype(np.int32)
+    correct_option = np.where(is_mc, bank.correct[word_ids, variant], -1).astype(np.int8)
+
+    false_defs = bank.tf_false[word_ids, variant]
+    tf_true = (rng.random(word_ids.shape) < 0.5) | (false_defs < 0)
+    is_tf = qtypes == TRUE_FALSE
+    tf_true &= is_tf
+    tf_shown = np.where(is_tf, np.where(tf_true, word_ids, false_defs), -1).astype(np.int32)
+
+    return TestBatch(
+        word_ids=word_ids,
+        qtypes=qtypes,
+        options=options,
+        correct_option=correct_option,
+        tf_true=tf_true,
+        tf_shown=tf_shown,
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    from core.distractors import DistractorPool
+    from core.index import VocabIndex
+    from core.similarity import load_similarity
+    from core.store import load_vocab_groups
+
+    vocab_index = VocabIndex(load_vocab_groups())
+    distractor_pool = DistractorPool(vocab_index)
+    similarity = None
+    for difficulty in DIFFICULTIES:
+        start = time.perf_counter()
+        if difficulty in SIMILAR_DIFFICULTIES and similarity is None:
+            similarity = load_similarity(vocab_index)
+        bank = load_bank(vocab_index, distractor_pool, difficulty, similarity)
+        print(f"{bank_path(difficulty)}: {vocab_index.total_words} words x {bank.variants} variants, "
+              f"ready in {time.perf_counter() - start:.1f}s")
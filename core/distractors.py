@@ -0,0 +1,26 @@
+"""Interned answer values for question generation.
+
+A word's candidate wrong answers are words whose answer text differs from
+its own. Each answer field is interned once per deck, so "same answer" is
+an integer comparison; :func:`core.questions.generate_tests` and
+:mod:`core.bank` draw distractors in bulk against these value ids.
+"""
+
+from array import array
+
+FIELDS = ("meaning", "simple")
+
+
+class DistractorPool:
+    """Interned value id of every word's answer fields."""
+
+    def __init__(self, vocab_index):
+        # Intern each field so "same answer" is an int comparison.
+        self._value_ids = {}
+        for field in FIELDS:
+            interned = {}
+            self._value_ids[field] = array("I", (interned.setdefault(w[field], len(interned)) for w in vocab_index.records))
+
+    def value_ids(self, field):
+        """Interned value id of ``field`` for every word id (an ``array('I')``)."""
+        return self._value_ids[field]
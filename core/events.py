@@ -0,0 +1,73 @@
+"""Per-answer events and the compacted per-word state folded from them.
+
+Answers are stored as an append-only log of small :class:`AnswerEvent`
+records. :class:`WordStats` is the aggregate state; it is periodically
+snapshotted so loading a user's stats costs the snapshot plus the events
+logged since, not a replay of their whole history.
+"""
+
+import struct
+from array import array
+from collections import namedtuple
+
+AnswerEvent = namedtuple("AnswerEvent", "word_id correct latency_ms ts")
+
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"WSTS"
+_VERSION = 1
+_FIELDS = (("attempts", "I"), ("correct", "I"), ("latency_ms", "d"), ("last_seen", "d"))
+
+
+class WordStats:
+    """Attempts, correct answers, total latency and last-seen time per word id."""
+
+    __slots__ = ("n_words", "events") + tuple(name for name, _ in _FIELDS)
+
+    def __init__(self, n_words):
+        self.n_words = n_words
+        self.events = 0
+        for name, typecode in _FIELDS:
+            setattr(self, name, array(typecode, [0]) * n_words)
+
+    def apply(self, event):
+        word_id = event.word_id
+        if not 0 <= word_id < self.n_words:
+            return
+        self.attempts[word_id] += 1
+        self.correct[word_id] += bool(event.correct)
+        self.latency_ms[word_id] += event.latency_ms
+        if event.ts > self.last_seen[word_id]:
+            self.last_seen[word_id] = event.ts
+        self.events += 1
+
+    def apply_many(self, events):
+        for event in events:
+            self.apply(event)
+
+    def error_rate(self, word_id):
+        attempts = self.attempts[word_id]
+        return 1 - self.correct[word_id] / attempts if attempts else 0.0
+
+    def to_bytes(self):
+        parts = [_HEADER.pack(_MAGIC, _VERSION, self.n_words), struct.pack("<Q", self.events)]
+        parts.extend(getattr(self, name).tobytes() for name, _ in _FIELDS)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, n_words = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("not a word stats snapshot")
+        stats = cls(n_words)
+        pos = _HEADER.size
+        (stats.events,) = struct.unpack_from("<Q", data, pos)
+        pos += 8
+        for name, typecode in _FIELDS:
+            buf = array(typecode)
+            size = buf.itemsize * n_words
+            buf.frombytes(data[pos:pos + size])
+            if len(buf) != n_words:
+                raise ValueError("word stats snapshot is truncated")
+            setattr(stats, name, buf)
+            pos += size
+        return stats
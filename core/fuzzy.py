@@ -0,0 +1,230 @@
+"""Typo-tolerant word lookup using a SymSpell-style deletion index.
+
+Each word's prefix is expanded into every variant with up to ``max_distance``
+characters deleted, and each variant is kept as a 64-bit hash pointing at
+the words it came from. A query is expanded the same way, so candidate words
+are found by a sorted-array search rather than by comparing against every
+word. At most ``MAX_CANDIDATES`` of them, those sharing the least-deleted
+variants first, are then checked with an edit distance computed for all of
+them at once.
+
+Run ``python -m core.fuzzy`` to precompute ``data/fuzzy_index.npz``; the app
+also builds it on first use if it is missing or out of date.
+"""
+
+import hashlib
+import os
+from itertools import combinations
+
+import numpy as np
+
+from core.store import BASE_DIR
+
+FUZZY_PATH = os.environ.get("GRE_FUZZY_PATH", os.path.join(BASE_DIR, "data", "fuzzy_index.npz"))
+MAX_DISTANCE = 2
+PREFIX_LENGTH = 7
+MAX_CANDIDATES = 512
+
+# Polynomial string hash over code points, wrapping at 64 bits
+_HASH_BASE = 0x100000001B3
+_MASK = (1 << 64) - 1
+
+
+def _hash(term):
+    h = 0
+    for ch in term:
+        h = (h * _HASH_BASE + ord(ch)) & _MASK
+    return h
+
+
+def _deletes(term, max_distance):
+    """Return ``term``'s deletion variants as lists by number of chars deleted (0 to ``max_distance``)."""
+    levels = [[term]]
+    seen = {term}
+    for _ in range(max_distance):
+        nxt = []
+        for s in levels[-1]:
+            for i in range(len(s)):
+                d = s[:i] + s[i + 1:]
+                if d not in seen:
+                    seen.add(d)
+                    nxt.append(d)
+        levels.append(nxt)
+    return levels
+
+
+def _code_points(terms):
+    """``(n, width)`` ``uint32`` matrix of code points, zero-padded on the right."""
+    width = max((len(t) for t in terms), default=0)
+    padded = "".join(t.ljust(width, "\0") for t in terms)
+    return np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(terms), width)
+
+
+def edit_distances(query, chars, lengths, max_distance):
+    """Optimal string alignment distance from ``query`` to every row of ``chars``, capped at ``max_distance + 1``.
+
+    Adjacent transpositions count as one edit, which covers the most common
+    typing slip ("recieve"). Rows are zero-padded code points of the given
+    ``lengths``; each DP row is computed for every candidate at once, the
+    insertion chain as a running minimum.
+    """
+    n, width = chars.shape
+    cols = np.arange(width + 1)
+    b = chars.astype(np.int64)
+    prev2 = None
+    prev = np.broadcast_to(cols, (n, width + 1))
+    for i, ch in enumerate(query, 1):
+        ca = ord(ch)
+        cost = (b != ca).astype(np.int64)
+        best = np.empty((n, width + 1), dtype=np.int64)
+        best[:, 0] = i
+        best[:, 1:] = np.minimum(prev[:, 1:] + 1, prev[:, :-1] + cost)
+        if prev2 is not None and width > 1:
+            swap = (b[:, :-1] == ca) & (b[:, 1:] == ord(query[i - 2]))
+            best[:, 2:] = np.where(swap, np.minimum(best[:, 2:], prev2[:, :-2] + 1), best[:, 2:])
+        # cur[j] = min(best[j], cur[j - 1] + 1) = j + min over k <= j of (best[k] - k)
+        cur = np.minimum.accumulate(best - cols, axis=1) + cols
+        prev2, prev = prev, cur
+    dist = prev[np.arange(n), lengths]
+    return np.minimum(dist, max_distance + 1)
+
+
+class FuzzyMatcher:
+    """Nearest-word lookup over the ``word`` field of a :class:`core.index.VocabIndex`.
+
+    ``term_ids`` is the first word id of each distinct lowercased spelling
+    and ``chars`` its code points; ``keys`` are the sorted deletion-variant
+    hashes, and ``postings[offsets[i]:offsets[i + 1]]`` the terms behind
+    ``keys[i]``.
+    """
+
+    def __init__(self, vocab_index, term_ids, chars, keys, offsets, postings,
+                 max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.term_ids = term_ids
+        self.chars = chars
+        self.lengths = (chars != 0).sum(axis=1)
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+        self._words = vocab_index.words
+
+    def candidates(self, q, max_distance):
+        """Term numbers sharing a deletion variant with ``q``, least-deleted variants first."""
+        found = []
+        for level in _deletes(q[:self.prefix_length], max_distance):
+            hashes = np.array([_hash(d) for d in level], dtype=np.uint64)
+            at = np.searchsorted(self.keys, hashes)
+            hit = at < len(self.keys)
+            hit[hit] = self.keys[at[hit]] == hashes[hit]
+            for i in at[hit]:
+                found.append(self.postings[self.offsets[i]:self.offsets[i + 1]])
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        merged = np.concatenate(found)
+        _, first = np.unique(merged, return_index=True)
+        return merged[np.sort(first)][:MAX_CANDIDATES]
+
+    def lookup(self, query, k=5, max_distance=None):
+        """Return up to ``k`` ``(word_id, distance)`` pairs, closest first."""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        q = query.strip().lower()
+        if not q:
+            return []
+
+        terms = self.candidates(q, max_distance)
+        terms = terms[np.abs(self.lengths[terms] - len(q)) <= max_distance]
+        if not len(terms):
+            return []
+        dist = edit_distances(q, self.chars[terms], self.lengths[terms], max_distance)
+        close = dist <= max_distance
+        matches = sorted(
+            (int(d), self._words[word_id].lower(), int(word_id))
+            for d, word_id in zip(dist[close], self.term_ids[terms[close]])
+        )
+        return [(word_id, d) for d, _, word_id in matches[:k]]
+
+
+def _fingerprint(terms, max_distance, prefix_length):
+    h = hashlib.sha256(f"{max_distance}:{prefix_length}:{_HASH_BASE}".encode())
+    for term in terms:
+        h.update(term.encode("utf-8"))
+        h.update(b"\0")
+    return np.frombuffer(h.digest(), dtype=np.uint8)
+
+
+def _distinct_terms(vocab_index):
+    """Each distinct lowercased spelling once, with its first word id."""
+    terms = {}
+    for word_id, word in enumerate(vocab_index.words):
+        terms.setdefault(word.lower(), word_id)
+    return list(terms), np.fromiter(terms.values(), dtype=np.uint32, count=len(terms))
+
+
+def build_fuzzy(vocab_index, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Build the deletion index, hashing every term's deletion variants with array operations."""
+    terms, term_ids = _distinct_terms(vocab_index)
+    chars = _code_points(terms)
+    prefixes = _code_points([t[:prefix_length] for t in terms]).astype(np.uint64)
+    width = prefixes.shape[1]
+
+    # One column mask per way of deleting up to max_distance positions;
+    # deleting padding just repeats a shorter variant and is deduplicated
+    hashes = []
+    for n_deleted in range(min(max_distance, width) + 1):
+        for deleted in combinations(range(width), n_deleted):
+            h = np.zeros(len(terms), dtype=np.uint64)
+            for col in range(width):
+                if col not in deleted:
+                    c = prefixes[:, col]
+                    h = np.where(c != 0, h * np.uint64(_HASH_BASE) + c, h)
+            hashes.append(h)
+    keys = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+    owners = np.tile(np.arange(len(terms), dtype=np.uint32), len(hashes))
+
+    order = np.lexsort((owners, keys))
+    keys, owners = keys[order], owners[order]
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (owners[1:] != owners[:-1])
+    keys, postings = keys[keep], owners[keep]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, dtype=np.int64)
+    offsets = np.append(starts, len(keys)).astype(np.int64)
+    return FuzzyMatcher(vocab_index, term_ids, chars, keys[starts], offsets, postings, max_distance, prefix_length)
+
+
+def load_fuzzy(vocab_index, path=FUZZY_PATH, max_distance=MAX_DISTANCE, prefix_length=PREFIX_LENGTH):
+    """Load the precomputed deletion index, rebuilding (and saving) it when stale."""
+    terms, _ = _distinct_terms(vocab_index)
+    fingerprint = _fingerprint(terms, max_distance, prefix_length)
+    try:
+        with np.load(path) as data:
+            if np.array_equal(data["fingerprint"], fingerprint):
+                return FuzzyMatcher(
+                    vocab_index, data["term_ids"], data["chars"], data["keys"], data["offsets"],
+                    data["postings"], max_distance, prefix_length,
+                )
+    except (OSError, KeyError, ValueError):
+        pass
+
+    matcher = build_fuzzy(vocab_index, max_distance, prefix_length)
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path, term_ids=matcher.term_ids, chars=matcher.chars, keys=matcher.keys,
+            offsets=matcher.offsets, postings=matcher.postings, fingerprint=fingerprint,
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return matcher
+
+
+if __name__ == "__main__":
+    from core.index import VocabIndex
+    from core.store import load_vocab_groups
+
+    vocab_index = VocabIndex(load_vocab_groups())
+    matcher = load_fuzzy(vocab_index)
+    print(f"Wrote {FUZZY_PATH}: {len(matcher.term_ids)} words, {len(matcher.keys)} deletion variants")
@@ -0,0 +1,98 @@
+"""Process-wide, read-only index over ``vocab_groups``.
+
+Words get a stable integer id (their position in group order), so later
+structures can refer to them with plain ints instead of strings.
+"""
+
+import hashlib
+from array import array
+from types import MappingProxyType
+
+
+class VocabIndex:
+    """Immutable lookup tables built once from ``vocab_groups``.
+
+    A handful of words appear in more than one group; ``word_ids``,
+    ``word_group`` and ``word_record`` map such words to their first
+    occurrence.
+
+    ``keys`` names every word id as ``"group\tword"`` and ``fingerprint``
+    hashes them, so state saved against one deck can be recognised, and
+    moved with :meth:`id_map`, after words are added or removed.
+    """
+
+    __slots__ = (
+        "group_names", "group_offsets", "group_position", "group_sizes",
+        "group_records", "group_words", "records", "words", "word_group_ids",
+        "word_ids", "word_group", "word_record", "total_words", "n_groups",
+        "keys", "fingerprint",
+    )
+
+    def __init__(self, vocab_groups):
+        group_names = []
+        group_offsets = [0]
+        group_records = {}
+        group_words = {}
+        records = []
+        word_group_ids = []
+        word_ids = {}
+        word_group = {}
+        word_record = {}
+
+        for g, (group, words) in enumerate(vocab_groups.items()):
+            group_names.append(group)
+            start = len(records)
+            for w in words:
+                word = w["word"]
+                if word not in word_ids:
+                    word_ids[word] = len(records)
+                    word_group[word] = group
+                    word_record[word] = w
+                records.append(w)
+                word_group_ids.append(g)
+            group_records[group] = tuple(records[start:])
+            group_words[group] = tuple(w["word"] for w in group_records[group])
+            group_offsets.append(len(records))
+
+        self.group_names = tuple(group_names)
+        self.group_offsets = tuple(group_offsets)
+        self.group_position = MappingProxyType({g: i for i, g in enumerate(group_names)})
+        self.group_sizes = MappingProxyType({g: len(group_records[g]) for g in group_names})
+        self.group_records = MappingProxyType(group_records)
+        self.group_words = MappingProxyType(group_words)
+        self.records = tuple(records)
+        self.words = tuple(w["word"] for w in records)
+        self.word_group_ids = tuple(word_group_ids)
+        self.word_ids = MappingProxyType(word_ids)
+        self.word_group = MappingProxyType(word_group)
+        self.word_record = MappingProxyType(word_record)
+        self.total_words = len(records)
+        self.n_groups = len(group_names)
+        self.keys = tuple(
+            f"{group_names[g]}\t{w['word']}" for g, w in zip(word_group_ids, records)
+        )
+        self.fingerprint = hashlib.sha256("\n".join(self.keys).encode("utf-8")).hexdigest()[:32]
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(f"VocabIndex.{name} is read-only")
+        object.__setattr__(self, name, value)
+
+    def id_map(self, old_keys):
+        """Map the word ids of a deck with ``old_keys`` to this deck's ids (``-1`` if gone).
+
+        A word is matched in the same group first, then anywhere in the deck.
+        """
+        positions = {key: i for i, key in reversed(list(enumerate(self.keys)))}
+        mapping = array("i")
+        for key in old_keys:
+            new = positions.get(key)
+            if new is None:
+                new = self.word_ids.get(key.partition("\t")[2], -1)
+            mapping.append(new)
+        return mapping
+
+    def group_range(self, group):
+        """Return the ``range`` of word ids belonging to ``group``."""
+        g = self.group_position[group]
+        return range(self.group_offsets[g], self.group_offsets[g + 1])
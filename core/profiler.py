@@ -0,0 +1,178 @@
+"""Opt-in timing of app sections.
+
+Code marks a section with ``with profiler.span("sidebar"):``. Each finished
+span records its wall time (``perf_counter_ns``) and, while ``tracemalloc``
+is tracing, the net change in traced memory. Samples are aggregated per
+section into a fixed-bucket histogram, which feeds the Prometheus dump, and
+a window of recent samples used for p50/p95.
+
+Profiling is off unless ``GRE_PROFILE`` is set (or the app turns it on for a
+session). Callers then get :data:`NULL_SPAN`, a shared do-nothing context
+manager, so a disabled span costs one attribute lookup and a ``with``.
+Allocations are only traced when ``GRE_PROFILE`` is set: ``tracemalloc``
+slows down every session in the process, not just the profiled one.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from collections import deque
+
+from core.store import BASE_DIR
+
+ENABLED = os.environ.get("GRE_PROFILE", "") not in ("", "0")
+PROFILE_PATH = os.environ.get("GRE_PROFILE_OUT", os.path.join(BASE_DIR, "data", "profile.json"))
+
+# Histogram bucket upper bounds, in milliseconds
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+RECENT = 1024
+
+NULL_SPAN = contextlib.nullcontext()
+
+
+class SectionStats:
+    """Aggregates for one section name."""
+
+    __slots__ = ("count", "total_ns", "max_ns", "alloc_bytes", "buckets", "recent")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.alloc_bytes = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)  # last one is +Inf
+        self.recent = deque(maxlen=RECENT)
+
+    def add(self, elapsed_ns, alloc_bytes):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.max_ns = max(self.max_ns, elapsed_ns)
+        self.alloc_bytes += alloc_bytes
+        self.buckets[bisect_left(BUCKETS_MS, elapsed_ns / 1e6)] += 1
+        self.recent.append(elapsed_ns)
+
+    def quantile(self, q):
+        """Quantile of the recent samples, in milliseconds."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1e6
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total_ns / 1e6,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": self.max_ns / 1e6,
+            "alloc_bytes_mean": self.alloc_bytes / self.count if self.count else 0,
+        }
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "start_ns", "start_mem")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start_mem = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.start_ns
+        alloc = 0
+        if self.start_mem is not None and tracemalloc.is_tracing():
+            alloc = tracemalloc.get_traced_memory()[0] - self.start_mem
+        self.profiler.record(self.name, elapsed, alloc)
+        return False
+
+
+class Profiler:
+    """Per-section timing histograms shared by every session in the process."""
+
+    def __init__(self, track_allocations=ENABLED):
+        self.track_allocations = track_allocations
+        self.sections = {}
+        self._lock = threading.Lock()
+        self._dump_lock = threading.Lock()
+        self._last_dump = 0.0
+
+    def start(self):
+        """Begin tracing allocations, if this profiler tracks them."""
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def record(self, name, elapsed_ns, alloc_bytes=0):
+        with self._lock:
+            stats = self.sections.get(name)
+            if stats is None:
+                stats = self.sections[name] = SectionStats()
+            stats.add(elapsed_ns, alloc_bytes)
+
+    def reset(self):
+        with self._lock:
+            self.sections = {}
+
+    def summary(self):
+        """``{section: {count, total_ms, p50_ms, p95_ms, max_ms, alloc_bytes_mean}}``."""
+        with self._lock:
+            return {name: stats.summary() for name, stats in sorted(self.sections.items())}
+
+    def to_json(self):
+        with self._lock:
+            sections = {}
+            for name, stats in sorted(self.sections.items()):
+                sections[name] = stats.summary()
+                sections[name]["buckets_ms"] = dict(zip([*map(str, BUCKETS_MS), "+Inf"], stats.buckets))
+        return json.dumps({"generated_at": time.time(), "sections": sections}, indent=2)
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP gre_section_seconds Time spent in each app section.",
+            "# TYPE gre_section_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self.sections.items())
+            for name, stats in items:
+                cumulative = 0
+                for bound, count in zip([*(b / 1000 for b in BUCKETS_MS), "+Inf"], stats.buckets):
+                    cumulative += count
+                    lines.append(f'gre_section_seconds_bucket{{section="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'gre_section_seconds_sum{{section="{name}"}} {stats.total_ns / 1e9}')
+                lines.append(f'gre_section_seconds_count{{section="{name}"}} {stats.count}')
+            lines.append("# HELP gre_section_alloc_bytes_total Net traced memory change across each section's runs.")
+            lines.append("# TYPE gre_section_alloc_bytes_total counter")
+            for name, stats in items:
+                lines.append(f'gre_section_alloc_bytes_total{{section="{name}"}} {stats.alloc_bytes}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=PROFILE_PATH):
+        """Write the aggregates to ``path``: Prometheus text for ``.prom``, JSON otherwise."""
+        # Sessions autosave from their own threads; one dump at a time, each
+        # through its own temporary file
+        with self._dump_lock:
+            text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+            self._last_dump = time.monotonic()
+        return path
+
+    def autosave(self, path=PROFILE_PATH, interval=10.0):
+        """Dump at most once per ``interval`` seconds."""
+        if time.monotonic() - self._last_dump >= interval:
+            self.dump(path)
+
+
+profiler = Profiler()
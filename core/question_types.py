@@ -0,0 +1,13 @@
+"""Question and test type constants shared by generation and stored records.
+
+Kept free of NumPy so the session model, and the pages that only read test
+history, can use them without loading :mod:`core.questions`.
+"""
+
+TEST_TYPES = ("Multiple Choice", "Fill in the Blank", "True/False", "Mixed Questions")
+MULTIPLE_CHOICE, FILL_BLANK, TRUE_FALSE = 0, 1, 2
+TYPE_KEYS = ("multiple_choice", "fill_blank", "true_false")
+DIFFICULTIES = ("Easy", "Medium", "Hard", "Expert")
+# Only these levels draw distractors from the similarity table
+SIMILAR_DIFFICULTIES = ("Hard", "Expert")
+N_OPTIONS = 4
@@ -0,0 +1,341 @@
+"""Batch, seeded question generation, independent of Streamlit.
+
+``generate_tests`` builds many tests at once with a NumPy ``Generator`` and
+returns them as a :class:`TestBatch` of parallel arrays (word ids, question
+types, option ids). Turn one test into the question dicts the app renders
+with :func:`to_question_dicts`.
+
+Example::
+
+    batch = generate_tests(["Group 1", "Group 2"], "Mixed Questions",
+                           n_questions=20, n_tests=500, seed=7)
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from core.question_types import (
+    DIFFICULTIES, FILL_BLANK, MULTIPLE_CHOICE, N_OPTIONS, SIMILAR_DIFFICULTIES, TEST_TYPES, TRUE_FALSE,
+)
+
+# Conflicting distractor slots are redrawn this many times before the
+# remaining few are resolved one question at a time.
+_MAX_ROUNDS = 32
+
+
+@dataclass(frozen=True)
+class TestBatch:
+    """Struct-of-arrays result of :func:`generate_tests`.
+
+    Shapes are ``(n_tests, n_questions)`` unless noted. ``options`` is
+    ``(n_tests, n_questions, N_OPTIONS)`` and holds the word ids whose
+    meanings are offered, padded with ``-1`` on the right when a pool has
+    fewer distinct meanings; it is all ``-1`` for non multiple-choice
+    questions.
+    """
+
+    word_ids: np.ndarray
+    qtypes: np.ndarray
+    options: np.ndarray
+    correct_option: np.ndarray
+    tf_true: np.ndarray
+    tf_shown: np.ndarray
+
+    @property
+    def n_tests(self):
+        return self.word_ids.shape[0]
+
+    @property
+    def n_questions(self):
+        return self.word_ids.shape[1]
+
+
+def _sample_without_replacement(rng, m, n_rows, k):
+    """Return ``(n_rows, k)`` positions in ``range(m)``, distinct within each row."""
+    if k == 0:
+        return np.empty((n_rows, 0), dtype=np.int64)
+    if 4 * k >= m:
+        keys = rng.random((n_rows, m))
+        pos = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        return rng.permuted(pos, axis=1)
+
+    pos = rng.integers(0, m, size=(n_rows, k))
+    while True:
+        order = np.argsort(pos, axis=1, kind="stable")
+        sorted_pos = np.take_along_axis(pos, order, axis=1)
+        dup_sorted = np.zeros_like(pos, dtype=bool)
+        dup_sorted[:, 1:] = sorted_pos[:, 1:] == sorted_pos[:, :-1]
+        if not dup_sorted.any():
+            return pos
+        dup = np.zeros_like(dup_sorted)
+        np.put_along_axis(dup, order, dup_sorted, axis=1)
+        pos[dup] = rng.integers(0, m, size=int(dup.sum()))
+
+
+def _draw_distractors(rng, word_ids, n_wrong, values, pool, deck_size, difficulty, neighbors):
+    """Vectorised distractor draw: ``(..., n_wrong)`` ids with distinct values.
+
+    Raises ValueError if the deck has fewer than ``n_wrong`` values other
+    than a word's own; callers size ``n_wrong`` so that it never does.
+    """
+    shape = word_ids.shape + (n_wrong,)
+    if n_wrong == 0:
+        return np.empty(shape, dtype=np.int64)
+
+    def from_pool(size):
+        return pool[rng.integers(0, len(pool), size=size)]
+
+    def from_deck(size):
+        return rng.integers(0, deck_size, size=size)
+
+    # Which slots draw from the neighbour table at this difficulty.
+    close = np.zeros(shape, dtype=bool)
+    if neighbors is not None and neighbors.shape[1] and difficulty in SIMILAR_DIFFICULTIES:
+        n_close = n_wrong if difficulty == "Expert" else (n_wrong + 1) // 2
+        close[..., :n_close] = True
+
+    def from_neighbors(words):
+        cols = rng.integers(0, neighbors.shape[1], size=words.shape)
+        return neighbors[words, cols].astype(np.int64)
+
+    fallback = from_deck if difficulty == "Easy" else from_pool
+    cand = fallback(shape)
+    word_grid = np.broadcast_to(word_ids[..., None], shape)
+    if close.any():
+        if difficulty == "Expert":
+            cols = np.minimum(np.arange(n_wrong), neighbors.shape[1] - 1)
+            first = neighbors[word_ids][..., cols].astype(np.int64)
+            cand = np.where(close, first, cand)
+        else:
+            cand[close] = from_neighbors(word_grid[close])
+
+    target = values[word_ids][..., None]
+    for round_ in range(_MAX_ROUNDS):
+        v = values[cand]
+        bad = v == target
+        for j in range(1, n_wrong):
+            bad[..., j] |= (v[..., :j] == v[..., j:j + 1]).any(axis=-1)
+        if not bad.any():
+            return cand
+        # Neighbour slots get a few retries before falling back to the pool.
+        retry_close = bad & close if round_ < 4 else np.zeros_like(bad)
+        retry_rest = bad & ~retry_close
+        if retry_close.any():
+            cand[retry_close] = from_neighbors(word_grid[retry_close])
+        if retry_rest.any():
+            cand[retry_rest] = fallback(int(retry_rest.sum()))
+
+    # Tiny or duplicate-heavy pools: finish the stragglers one by one, from
+    # the pool and then, if it runs out of distinct values, the whole deck.
+    scopes = (deck_size,) if difficulty == "Easy" else (pool, deck_size)
+    for idx in zip(*np.nonzero(bad.any(axis=-1))):
+        seen = {values[word_ids[idx]]}
+        picked = []
+        for scope in scopes:
+            for c in rng.permutation(scope):
+                if values[c] not in seen:
+                    seen.add(values[c])
+                    picked.append(c)
+                    if len(picked) == n_wrong:
+                        break
+            if len(picked) == n_wrong:
+                break
+        if len(picked) < n_wrong:
+            raise ValueError(f"word {word_ids[idx]} has {len(picked)} distinct distractors, {n_wrong} needed")
+        cand[idx] = picked
+    return cand
+
+
+def generate_tests(groups, test_type, n_questions, n_tests=1, seed=None,
+                   difficulty="Medium", vocab_index=None, distractor_pool=None, similarity=None):
+    """Generate ``n_tests`` tests of ``n_questions`` questions drawn from ``groups``.
+
+    ``seed`` makes the result deterministic. The vocabulary index and
+    distractor pool default to the shared process-wide ones; pass a
+    :class:`core.similarity.SimilarityTable` to use similar definitions at
+    Hard/Expert difficulty.
+    """
+    if test_type not in TEST_TYPES:
+        raise ValueError(f"unknown test type {test_type!r}")
+    if difficulty not in DIFFICULTIES:
+        raise ValueError(f"unknown difficulty {difficulty!r}")
+    if vocab_index is None or distractor_pool is None:
+        from core.distractors import DistractorPool
+        from core.index import VocabIndex
+        from core.store import load_vocab_groups
+
+        vocab_index = vocab_index or VocabIndex(load_vocab_groups())
+        distractor_pool = distractor_pool or DistractorPool(vocab_index)
+
+    rng = np.random.default_rng(seed)
+    pool = np.concatenate([
+        np.arange(r.start, r.stop) for r in (vocab_index.group_range(g) for g in groups)
+    ]) if groups else np.empty(0, dtype=np.int64)
+    n_q = min(n_questions, len(pool))
+    neighbors = similarity.neighbors if similarity is not None else None
+
+    word_ids = pool[_sample_without_replacement(rng, len(pool), n_tests, n_q)]
+    if test_type == "Mixed Questions":
+        qtypes = rng.integers(0, 3, size=word_ids.shape).astype(np.int8)
+    else:
+        qtypes = np.full(word_ids.shape, TEST_TYPES.index(test_type), dtype=np.int8)
+
+    # Multiple choice: wrong meanings plus the correct one, shuffled.
+    meanings = np.frombuffer(distractor_pool.value_ids("meaning"), dtype=np.uint32)
+    scope_size = vocab_index.total_words if difficulty == "Easy" else len(pool)
+    distinct = len(np.unique(meanings)) if difficulty == "Easy" else len(np.unique(meanings[pool]))
+    n_wrong = max(0, min(N_OPTIONS - 1, distinct - 1, scope_size - 1))
+    wrong = _draw_distractors(rng, word_ids, n_wrong, meanings, pool, vocab_index.total_words, difficulty, neighbors)
+    options = rng.permuted(np.concatenate([wrong, word_ids[..., None]], axis=-1), axis=-1)
+    correct_option = np.argmax(options == word_ids[..., None], axis=-1).astype(np.int8)
+    # Pools short of distinct meanings give fewer options; pad to N_OPTIONS with -1
+    options = np.pad(options, [(0, 0), (0, 0), (0, N_OPTIONS - options.shape[-1])], constant_values=-1)
+    is_mc = qtypes == MULTIPLE_CHOICE
+    options = np.where(is_mc[..., None], options, -1).astype(np.int32)
+    correct_option = np.where(is_mc, correct_option, -1).astype(np.int8)
+
+    # True/False: show the word's own definition or a different one (if the
+    # deck has one).
+    simples = np.frombuffer(distractor_pool.value_ids("simple"), dtype=np.uint32)
+    n_false = min(1, len(np.unique(simples)) - 1)
+    false_defs = _draw_distractors(rng, word_ids, n_false, simples, pool, vocab_index.total_words, difficulty, neighbors)
+    false_defs = false_defs[..., 0] if n_false else word_ids
+    tf_true = (rng.random(word_ids.shape) < 0.5) | (simples[false_defs] == simples[word_ids])
+    is_tf = qtypes == TRUE_FALSE
+    tf_true &= is_tf
+    tf_shown = np.where(is_tf, np.where(tf_true, word_ids, false_defs), -1).astype(np.int32)
+
+    return TestBatch(
+        word_ids=word_ids.astype(np.int32),
+        qtypes=qtypes,
+        options=options,
+        correct_option=correct_option,
+        tf_true=tf_true,
+        tf_shown=tf_shown,
+    )
+
+
+def render_question(vocab_index, qtype, word_id, option_ids=(), shown_id=-1):
+    """Build the question dict the app displays from word ids alone.
+
+    ``option_ids`` are the multiple-choice options and ``shown_id`` the word
+    whose definition a True/False statement shows.
+    """
+    records = vocab_index.records
+    word_data = records[word_id]
+    if qtype == MULTIPLE_CHOICE:
+        return {
+            "type": "multiple_choice",
+            "word": word_data['word'],
+            "word_id": int(word_id),
+            "correct_answer": word_data['meaning'],
+            "options": [records[i]['meaning'] for i in option_ids if i >= 0],
+            "question": f"What does '{word_data['word']}' mean?",
+            "simple_def": word_data['simple']
+        }
+    if qtype == FILL_BLANK:
+        return {
+            "type": "fill_blank",
+            "word": word_data['word'],
+            "word_id": int(word_id),
+            "correct_answer": word_data['simple'],
+            "question": f"'{word_data['word']}' means: _________",
+            "hint": word_data['meaning']
+        }
+    return {
+        "type": "true_false",
+        "word": word_data['word'],
+        "word_id": int(word_id),
+        "correct_answer": "True" if shown_id == word_id else "False",
+        "statement": f"'{word_data['word']}' means: {records[shown_id]['simple']}",
+        "actual_meaning": word_data['meaning']
+    }
+
+
+def question_dict(batch, test, q, vocab_index):
+    """Render question ``q`` of test number ``test`` in ``batch``."""
+    return render_question(
+        vocab_index, batch.qtypes[test, q], int(batch.word_ids[test, q]),
+        batch.options[test, q], int(batch.tf_shown[test, q]),
+    )
+
+
+def batch_from_record(word_ids, qtypes, tf_shown, options):
+    """Rebuild a one-test :class:`TestBatch` from a saved test.
+
+    ``word_ids``, ``qtypes`` and ``tf_shown`` are per question (as kept by
+    :class:`core.session_model.TestRecord`); ``options`` is the int32 bytes
+    of the ``(n_questions, N_OPTIONS)`` multiple-choice option ids. The
+    correct option and True/False truth are derived from those.
+    """
+    word_ids = np.array(word_ids, dtype=np.int32)[None]
+    qtypes = np.frombuffer(bytes(qtypes), dtype=np.int8)[None]
+    options = np.frombuffer(options, dtype=np.int32).reshape(1, -1, N_OPTIONS)
+    tf_shown = np.array(tf_shown, dtype=np.int32)[None]
+    is_mc = qtypes == MULTIPLE_CHOICE
+    return TestBatch(
+        word_ids=word_ids,
+        qtypes=qtypes,
+        options=options,
+        correct_option=np.where(is_mc, np.argmax(options == word_ids[..., None], axis=-1), -1).astype(np.int8),
+        tf_true=(qtypes == TRUE_FALSE) & (tf_shown == word_ids),
+        tf_shown=tf_shown,
+    )
+
+
+def grade_test(batch, test, answers, typed, vocab_index):
+    """Grade every answer of test number ``test`` in one pass.
+
+    ``answers`` holds, per question, the word id of the chosen option
+    (multiple choice), 1/0 (True/False) or a negative code for a skipped or
+    typed answer; ``typed`` maps question positions to fill-in text. Returns
+    a bool array.
+    """
+    answers = np.asarray(answers)
+    word_ids = batch.word_ids[test]
+    correct = np.where(
+        batch.qtypes[test] == MULTIPLE_CHOICE, answers == word_ids, (answers == 1) == batch.tf_true[test]
+    ) & (answers >= 0)
+    # Same loose check as a single fill-in answer: the definition appears in the text
+    for q, text in typed.items():
+        correct[q] = vocab_index.records[word_ids[q]]['simple'].lower() in text.lower()
+    return correct
+
+
+def to_question_dicts(batch, test, vocab_index):
+    """Render test number ``test`` of ``batch`` as the app's question dicts."""
+    return [question_dict(batch, test, q, vocab_index) for q in range(batch.n_questions)]
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from core.distractors import DistractorPool
+    from core.index import VocabIndex
+    from core.similarity import load_similarity
+    from core.store import load_vocab_groups
+
+    parser = argparse.ArgumentParser(description="Pre-generate test sets and report throughput.")
+    parser.add_argument("--groups", nargs="*", help="group names (default: every group)")
+    parser.add_argument("--type", default="Mixed Questions", choices=TEST_TYPES)
+    parser.add_argument("--difficulty", default="Medium", choices=DIFFICULTIES)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--tests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="save the batch to this .npz file")
+    args = parser.parse_args()
+
+    vocab_index = VocabIndex(load_vocab_groups())
+    pool = DistractorPool(vocab_index)
+    similarity = load_similarity(vocab_index) if args.difficulty in SIMILAR_DIFFICULTIES else None
+
+    start = time.perf_counter()
+    batch = generate_tests(args.groups or vocab_index.group_names, args.type, args.questions,
+                           args.tests, args.seed, args.difficulty, vocab_index, pool, similarity)
+    elapsed = time.perf_counter() - start
+    print(f"{batch.n_tests} tests x {batch.n_questions} questions in {elapsed * 1000:.1f} ms "
+          f"({batch.n_tests * batch.n_questions / elapsed:,.0f} questions/s)")
+    if args.out:
+        np.savez_compressed(args.out, **{f: getattr(batch, f) for f in TestBatch.__dataclass_fields__})
+        print(f"Saved {args.out}")
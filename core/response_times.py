@@ -0,0 +1,73 @@
+"""Response-time distributions per word and per group.
+
+Built from the raw ``(word_id, latency_ms)`` answer log with one sort and a
+few array operations: answers are ordered by (key, latency), so every
+word's or group's latencies form a sorted run and any quantile is an
+index into it. Tens of thousands of answers take tens of milliseconds,
+even on a 100k-word deck.
+"""
+
+import numpy as np
+
+QUANTILES = (0.25, 0.5, 0.9)
+
+
+def grouped_quantiles(keys, values, n_keys, quantiles=QUANTILES):
+    """Return ``(counts, table)``: answers per key and a ``(len(quantiles), n_keys)`` table.
+
+    Quantiles are linearly interpolated, as ``np.quantile`` does; keys
+    without answers get NaN.
+    """
+    counts = np.bincount(keys, minlength=n_keys)
+    table = np.full((len(quantiles), n_keys), np.nan)
+    if not len(keys):
+        return counts, table
+    ordered = values[np.lexsort((values, keys))].astype(np.float64)
+    starts = np.cumsum(counts) - counts
+    has = np.flatnonzero(counts)
+    for i, q in enumerate(quantiles):
+        pos = starts[has] + (counts[has] - 1) * q
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, starts[has] + counts[has] - 1)
+        table[i, has] = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    return counts, table
+
+
+class ResponseTimes:
+    """Quantiles of a user's timed answers, in milliseconds, per word id and per group position.
+
+    ``word_counts`` / ``group_counts`` hold answers per word / group and
+    ``words`` / ``groups`` the ``QUANTILES`` of their latencies.
+    """
+
+    def __init__(self, word_ids, latency_ms, vocab_index):
+        word_ids = np.asarray(word_ids, dtype=np.int64)
+        latency_ms = np.asarray(latency_ms, dtype=np.int64)
+        # Answers logged against an older, longer deck are dropped
+        keep = word_ids < vocab_index.total_words
+        word_ids, latency_ms = word_ids[keep], latency_ms[keep]
+        group_ids = np.asarray(vocab_index.word_group_ids, dtype=np.int64)[word_ids]
+
+        self.latency_ms = latency_ms
+        self.word_counts, self.words = grouped_quantiles(word_ids, latency_ms, vocab_index.total_words)
+        self.group_counts, self.groups = grouped_quantiles(group_ids, latency_ms, vocab_index.n_groups)
+
+    @property
+    def n_answers(self):
+        return len(self.latency_ms)
+
+    def quantile(self, q):
+        return float(np.quantile(self.latency_ms, q)) if self.n_answers else float("nan")
+
+    def slowest_words(self, k=10, min_answers=2):
+        """Word ids with the highest median latency among those answered ``min_answers`` times or more."""
+        median = self.words[QUANTILES.index(0.5)]
+        candidates = np.flatnonzero(self.word_counts >= min_answers)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-median[candidates], k - 1)[:k]]
+        return candidates[np.argsort(-median[candidates], kind="stable")].tolist()
+
+    def histogram(self, edges_ms):
+        """Answer counts between consecutive ``edges_ms``; the last bin is open-ended."""
+        bins = np.searchsorted(np.asarray(edges_ms), self.latency_ms, side="right") - 1
+        return np.bincount(bins[bins >= 0], minlength=len(edges_ms))[:len(edges_ms)]
@@ -0,0 +1,114 @@
+"""Error-weighted, group-stratified word sampling for tests.
+
+Every word is weighted by its smoothed error rate, ``(wrong + 1) /
+(attempts + 2)``: unseen words weigh 0.5, words the user keeps missing
+approach 1 and words they always get right fade towards 0 without
+disappearing.
+
+A test first splits its questions between the chosen groups in proportion
+to their total weight (systematic sampling, so each group gets the floor or
+the ceiling of its share), then draws words inside each group from that
+group's alias table in O(1) per draw. The tables are built once from a
+user's :class:`core.events.WordStats` and only the groups of newly answered
+words are rebuilt afterwards.
+"""
+
+import numpy as np
+
+
+def _alias_table(weights):
+    """Vose's alias method: ``(prob, alias)`` for sampling ``weights``."""
+    n = len(weights)
+    scaled = (weights * (n / weights.sum())).tolist()
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s], alias[s] = scaled[s], l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    # Whatever is left over is 1 up to rounding
+    return np.array(prob), np.array(alias, dtype=np.int64)
+
+
+class WordSampler:
+    """Draws distinct test words from any set of groups, favouring the user's mistakes."""
+
+    def __init__(self, vocab_index, stats):
+        self.offsets = np.asarray(vocab_index.group_offsets, dtype=np.int64)
+        self.group_ids = np.asarray(vocab_index.word_group_ids, dtype=np.int64)
+        n_words = vocab_index.total_words
+        self.weights = np.empty(n_words)
+        self.prob = np.empty(n_words)
+        self.alias = np.empty(n_words, dtype=np.int64)
+        self.mass = np.zeros(vocab_index.n_groups)
+        for g in range(vocab_index.n_groups):
+            self._build_group(stats, g)
+
+    def _build_group(self, stats, g):
+        start, stop = int(self.offsets[g]), int(self.offsets[g + 1])
+        if start == stop:
+            return
+        attempts = np.asarray(stats.attempts[start:stop], dtype=np.float64)
+        wrong = attempts - np.asarray(stats.correct[start:stop], dtype=np.float64)
+        weights = (wrong + 1) / (attempts + 2)
+        prob, alias = _alias_table(weights)
+        self.weights[start:stop] = weights
+        self.prob[start:stop] = prob
+        self.alias[start:stop] = alias + start
+        self.mass[g] = weights.sum()
+
+    def update(self, stats, word_ids):
+        """Rebuild the tables of the groups holding ``word_ids`` after their stats changed."""
+        word_ids = np.asarray(word_ids, dtype=np.int64)
+        for g in np.unique(self.group_ids[word_ids]):
+            self._build_group(stats, int(g))
+
+    def allocate(self, rng, groups, n):
+        """Split ``n`` questions between group positions ``groups`` by weight, capped at group size."""
+        groups = np.asarray(groups, dtype=np.int64)
+        sizes = self.offsets[groups + 1] - self.offsets[groups]
+        counts = np.zeros(len(groups), dtype=np.int64)
+        left = min(n, int(sizes.sum()))
+        while left:
+            # A group filled to its size drops out and its share goes to the rest
+            mass = np.where(counts < sizes, self.mass[groups], 0.0)
+            bounds = np.cumsum(mass) * (left / mass.sum())
+            points = rng.random() + np.arange(left)
+            hits = np.minimum(np.searchsorted(bounds, points, side="right"), len(groups) - 1)
+            added = np.minimum(np.bincount(hits, minlength=len(groups)), sizes - counts)
+            counts += added
+            left -= int(added.sum())
+        return counts
+
+    def draw(self, rng, groups, n):
+        """Return up to ``n`` distinct word ids from group positions ``groups``, in random order."""
+        groups = np.asarray(groups, dtype=np.int64)
+        counts = self.allocate(rng, groups, n)
+        sizes = self.offsets[groups + 1] - self.offsets[groups]
+        chosen = []
+
+        # Groups asked for more than half their words: one weighted draw
+        # without replacement, as rejection would mostly hit repeats
+        dense = 2 * counts > sizes
+        for g, k in zip(groups[dense], counts[dense]):
+            start, stop = self.offsets[g], self.offsets[g + 1]
+            weights = self.weights[start:stop]
+            chosen.append(start + rng.choice(stop - start, size=k, replace=False, p=weights / weights.sum()))
+
+        # Everything else: alias draws, redrawing repeats for their group
+        need = np.repeat(groups[~dense], counts[~dense])
+        drawn = np.empty(0, dtype=np.int64)
+        while len(need):
+            starts = self.offsets[need]
+            slots = starts + (rng.random(len(need)) * (self.offsets[need + 1] - starts)).astype(np.int64)
+            picks = np.where(rng.random(len(need)) < self.prob[slots], slots, self.alias[slots])
+            merged = np.concatenate([drawn, picks])
+            drawn, first = np.unique(merged, return_index=True)
+            repeat = np.ones(len(merged), dtype=bool)
+            repeat[first] = False
+            need = self.group_ids[merged[repeat]]
+        chosen.append(drawn)
+        return rng.permutation(np.concatenate(chosen)).astype(np.int32)
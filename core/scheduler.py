@@ -0,0 +1,137 @@
+"""SM-2 spaced-repetition scheduler spanning the whole deck.
+
+Per-word state (ease, interval, due time, repetitions, lapses) lives in flat
+``array`` buffers indexed by word id. Reviewed cards sit in a heap keyed by
+due time; entries are invalidated lazily, so both grading a card and finding
+the next one are O(log n). New cards are introduced in word-id order, up to
+a daily limit.
+"""
+
+import base64
+import heapq
+import time
+from array import array
+
+GRADES = {"Again": 0, "Hard": 3, "Good": 4, "Easy": 5}
+DAY = 86400.0
+RELEARN_DELAY = 600.0
+MIN_EASE = 1.3
+
+_STATE_FIELDS = (("ease", "f"), ("interval", "f"), ("due", "d"), ("reps", "H"), ("lapses", "H"))
+
+
+class ReviewScheduler:
+    """SM-2 card state for ``n_words`` word ids plus a due-card queue."""
+
+    def __init__(self, n_words, new_per_day=20):
+        self.n_words = n_words
+        self.new_per_day = new_per_day
+        self.ease = array("f", [2.5]) * n_words
+        self.interval = array("f", [0.0]) * n_words
+        self.due = array("d", [0.0]) * n_words
+        self.reps = array("H", [0]) * n_words
+        self.lapses = array("H", [0]) * n_words
+        self.reviews = 0
+        self._heap = []
+        self._next_new = 0
+        self._new_day = 0
+        self._new_today = 0
+
+    def _is_new(self, word_id):
+        return self.due[word_id] == 0.0
+
+    def _advance_new(self):
+        while self._next_new < self.n_words and not self._is_new(self._next_new):
+            self._next_new += 1
+
+    def next_card(self, now=None):
+        """Return the word id to review next, or ``None`` if nothing is due."""
+        now = time.time() if now is None else now
+        heap = self._heap
+        while heap and heap[0][0] != self.due[heap[0][1]]:
+            heapq.heappop(heap)
+        if heap and heap[0][0] <= now:
+            return heap[0][1]
+
+        day = int(now // DAY)
+        if day != self._new_day:
+            self._new_day, self._new_today = day, 0
+        self._advance_new()
+        if self._next_new < self.n_words and self._new_today < self.new_per_day:
+            return self._next_new
+        return None
+
+    def next_due_time(self):
+        """Due time of the earliest scheduled review, or ``None``."""
+        heap = self._heap
+        while heap and heap[0][0] != self.due[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def review(self, word_id, grade, now=None):
+        """Record a review with an SM-2 quality grade (0-5) and reschedule the card."""
+        now = time.time() if now is None else now
+        if self._is_new(word_id):
+            day = int(now // DAY)
+            if day != self._new_day:
+                self._new_day, self._new_today = day, 0
+            self._new_today += 1
+
+        if grade < 3:
+            self.reps[word_id] = 0
+            self.lapses[word_id] = min(self.lapses[word_id] + 1, 0xFFFF)
+            self.interval[word_id] = 0.0
+            due = now + RELEARN_DELAY
+        else:
+            reps = self.reps[word_id]
+            if reps == 0:
+                interval = 1.0
+            elif reps == 1:
+                interval = 6.0
+            else:
+                interval = self.interval[word_id] * self.ease[word_id]
+            self.interval[word_id] = interval
+            self.reps[word_id] = min(reps + 1, 0xFFFF)
+            due = now + interval * DAY
+
+        self.ease[word_id] = max(MIN_EASE, self.ease[word_id] + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+        self.due[word_id] = due
+        self.reviews += 1
+        heapq.heappush(self._heap, (due, word_id))
+
+    def to_dict(self):
+        """JSON-serialisable snapshot of the scheduler state."""
+        data = {name: base64.b64encode(getattr(self, name).tobytes()).decode("ascii") for name, _ in _STATE_FIELDS}
+        data.update(n_words=self.n_words, new_per_day=self.new_per_day, reviews=self.reviews,
+                    new_day=self._new_day, new_today=self._new_today)
+        return data
+
+    def remapped(self, mapping, n_words):
+        """A copy for a changed deck: word ``i``'s card moves to ``mapping[i]``; ``-1`` drops it."""
+        scheduler = ReviewScheduler(n_words, self.new_per_day)
+        for old, new in enumerate(mapping):
+            if 0 <= new < n_words and old < self.n_words:
+                for name, _ in _STATE_FIELDS:
+                    getattr(scheduler, name)[new] = getattr(self, name)[old]
+        scheduler.reviews = self.reviews
+        scheduler._new_day = self._new_day
+        scheduler._new_today = self._new_today
+        scheduler._heap = [(due, i) for i, due in enumerate(scheduler.due) if due]
+        heapq.heapify(scheduler._heap)
+        return scheduler
+
+    @classmethod
+    def from_dict(cls, data):
+        scheduler = cls(data["n_words"], data.get("new_per_day", 20))
+        for name, typecode in _STATE_FIELDS:
+            buf = array(typecode)
+            buf.frombytes(base64.b64decode(data[name]))
+            if len(buf) != scheduler.n_words:
+                raise ValueError(f"scheduler field {name!r} has the wrong length")
+            setattr(scheduler, name, buf)
+        scheduler.reviews = data.get("reviews", 0)
+        scheduler._new_day = data.get("new_day", 0)
+        scheduler._new_today = data.get("new_today", 0)
+        scheduler._heap = [(due, i) for i, due in enumerate(scheduler.due) if due]
+        heapq.heapify(scheduler._heap)
+        return scheduler
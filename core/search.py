@@ -0,0 +1,220 @@
+"""N-gram inverted index for substring and prefix search over the vocabulary.
+
+Every word record is indexed on the lowercased ``word``, ``simple`` and
+``meaning`` fields. Each 1- to 3-character gram is packed into one integer
+(21 bits per code point) and its postings are a sorted run of word ids in
+one flat array, so a query only touches the rarest of its grams and then
+verifies the few candidates with a plain substring check.
+
+Run ``python -m core.search`` to precompute ``data/search_index.npz``; the
+app also builds it on first use if it is missing or out of date.
+"""
+
+import hashlib
+import os
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from core.store import BASE_DIR
+
+SEARCH_PATH = os.environ.get("GRE_SEARCH_PATH", os.path.join(BASE_DIR, "data", "search_index.npz"))
+MAX_GRAM = 3
+_SEP = "\x00"
+_BITS = 21  # enough for any Unicode code point
+
+
+def _gram_code(gram):
+    code = 0
+    for i, ch in enumerate(gram):
+        code |= ord(ch) << (_BITS * (MAX_GRAM - 1 - i))
+    return code
+
+
+def _haystacks(vocab_index):
+    return tuple(
+        _SEP.join((w["word"], w["simple"], w["meaning"])).lower()
+        for w in vocab_index.records
+    )
+
+
+class SearchIndex:
+    """Shared search index over a :class:`core.index.VocabIndex`.
+
+    ``grams`` holds the sorted gram codes and ``postings[offsets[i]:offsets[i + 1]]``
+    the ids of the words containing gram ``i``; ``sorted_ids`` lists word ids
+    in alphabetical order for prefix search.
+    """
+
+    def __init__(self, vocab_index, grams, offsets, postings, sorted_ids, haystacks=None):
+        self._vocab_index = vocab_index
+        self._haystacks = haystacks if haystacks is not None else _haystacks(vocab_index)
+        self.grams = grams
+        self.offsets = offsets
+        self.postings = postings
+        self.sorted_ids = sorted_ids
+
+        words = vocab_index.words
+        self._sorted_ids = tuple(sorted_ids.tolist())
+        self._sorted_words = tuple(words[i].lower() for i in self._sorted_ids)
+
+    def _posting(self, gram):
+        code = _gram_code(gram)
+        i = int(np.searchsorted(self.grams, code))
+        if i == len(self.grams) or self.grams[i] != code:
+            return self.postings[:0]
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def _scope(self, group):
+        if group is not None:
+            return self._vocab_index.group_range(group)
+        return range(len(self._haystacks))
+
+    def _candidates(self, q, scope):
+        """Return ``(postings, lo, hi)``: the rarest gram's postings and the slice inside ``scope``."""
+        n = min(MAX_GRAM, len(q))
+        grams = {q[i:i + n] for i in range(len(q) - n + 1)}
+        candidates = min((self._posting(g) for g in grams), key=len)
+        lo, hi = np.searchsorted(candidates, (scope.start, scope.stop))
+        return candidates, int(lo), int(hi)
+
+    def search(self, query, group=None, limit=None):
+        """Return ids of words whose word, definition or meaning contains ``query``.
+
+        Ids come back in vocabulary order. ``group`` restricts the search to one
+        group; an empty query matches everything in scope.
+        """
+        scope = self._scope(group)
+        q = query.strip().lower()
+        if not q:
+            return list(scope[:limit])
+
+        candidates, lo, hi = self._candidates(q, scope)
+        if len(q) <= MAX_GRAM:
+            # The query is itself a gram, so its postings are exact.
+            if limit is not None:
+                hi = min(hi, lo + limit)
+            return candidates[lo:hi].tolist()
+
+        hits = []
+        haystacks = self._haystacks
+        for word_id in candidates[lo:hi].tolist():
+            if q in haystacks[word_id]:
+                hits.append(word_id)
+                if limit is not None and len(hits) >= limit:
+                    break
+        return hits
+
+    def count(self, query, group=None):
+        """Number of words :meth:`search` would return without a limit."""
+        scope = self._scope(group)
+        q = query.strip().lower()
+        if not q:
+            return len(scope)
+
+        candidates, lo, hi = self._candidates(q, scope)
+        if len(q) <= MAX_GRAM:
+            return hi - lo
+        haystacks = self._haystacks
+        return sum(1 for word_id in candidates[lo:hi].tolist() if q in haystacks[word_id])
+
+    def _prefix_range(self, query):
+        q = query.strip().lower()
+        lo = bisect_left(self._sorted_words, q)
+        return lo, bisect_right(self._sorted_words, q + "\U0010ffff", lo)
+
+    def prefix(self, query, limit=None):
+        """Return ids of words starting with ``query``, in alphabetical order."""
+        lo, hi = self._prefix_range(query)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return list(self._sorted_ids[lo:hi])
+
+    def prefix_count(self, query):
+        """Number of words starting with ``query``."""
+        lo, hi = self._prefix_range(query)
+        return hi - lo
+
+
+def _fingerprint(vocab_index, haystacks):
+    h = hashlib.sha256(f"{MAX_GRAM}:{_BITS}".encode())
+    h.update("\n".join(vocab_index.words).encode("utf-8"))
+    h.update(_SEP.join(haystacks).encode("utf-8"))
+    return np.frombuffer(h.digest(), dtype=np.uint8)
+
+
+def build_search_index(vocab_index, haystacks=None):
+    """Build the gram postings with array operations over the concatenated haystacks."""
+    if haystacks is None:
+        haystacks = _haystacks(vocab_index)
+    # Haystacks are joined by the separator, so no gram spans two words
+    text = np.frombuffer(_SEP.join(haystacks).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    lengths = np.fromiter((len(h) for h in haystacks), dtype=np.int64, count=len(haystacks))
+    owner = np.repeat(np.arange(len(haystacks), dtype=np.uint32), lengths + 1)[:len(text)]
+
+    codes, owners = [], []
+    for n in range(1, MAX_GRAM + 1):
+        if len(text) < n:
+            break
+        windows = len(text) - n + 1
+        code = np.zeros(windows, dtype=np.int64)
+        valid = np.ones(windows, dtype=bool)
+        for i in range(n):
+            chars = text[i:i + windows]
+            code |= chars << (_BITS * (MAX_GRAM - 1 - i))
+            valid &= chars != 0
+        code, ids = code[valid], owner[:windows][valid]
+        # One posting per (gram, word)
+        order = np.lexsort((ids, code))
+        code, ids = code[order], ids[order]
+        keep = np.ones(len(code), dtype=bool)
+        keep[1:] = (code[1:] != code[:-1]) | (ids[1:] != ids[:-1])
+        codes.append(code[keep])
+        owners.append(ids[keep])
+
+    code = np.concatenate(codes) if codes else np.empty(0, dtype=np.int64)
+    postings = np.concatenate(owners) if owners else np.empty(0, dtype=np.uint32)
+    # Gram lengths never share a code, so a stable sort keeps each run's ids in order
+    order = np.argsort(code, kind="stable")
+    code, postings = code[order], postings[order]
+    starts = np.flatnonzero(np.r_[True, code[1:] != code[:-1]]) if len(code) else np.empty(0, dtype=np.int64)
+    offsets = np.append(starts, len(code)).astype(np.int64)
+
+    lowered = sorted((word.lower(), word_id) for word_id, word in enumerate(vocab_index.words))
+    sorted_ids = np.array([word_id for _, word_id in lowered], dtype=np.uint32)
+    return SearchIndex(vocab_index, code[starts], offsets, postings, sorted_ids, haystacks)
+
+
+def load_search_index(vocab_index, path=SEARCH_PATH):
+    """Load the precomputed postings, rebuilding (and saving) them when stale."""
+    haystacks = _haystacks(vocab_index)
+    fingerprint = _fingerprint(vocab_index, haystacks)
+    try:
+        with np.load(path) as data:
+            if np.array_equal(data["fingerprint"], fingerprint):
+                return SearchIndex(
+                    vocab_index, data["grams"], data["offsets"], data["postings"], data["sorted_ids"], haystacks,
+                )
+    except (OSError, KeyError, ValueError):
+        pass
+
+    index = build_search_index(vocab_index, haystacks)
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path, grams=index.grams, offsets=index.offsets, postings=index.postings,
+            sorted_ids=index.sorted_ids, fingerprint=fingerprint,
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return index
+
+
+if __name__ == "__main__":
+    from core.index import VocabIndex
+    from core.store import load_vocab_groups
+
+    vocab_index = VocabIndex(load_vocab_groups())
+    index = load_search_index(vocab_index)
+    print(f"Wrote {SEARCH_PATH}: {len(index.grams)} grams, {len(index.postings)} postings")
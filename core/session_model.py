@@ -0,0 +1,347 @@
+"""Compact per-session progress and test records.
+
+Sessions keep word ids and small integer codes in ``array``/``bytearray``
+buffers instead of nested dicts of strings. Display strings (question text,
+answers, dates) are rebuilt from the shared :class:`core.index.VocabIndex`
+only when a page renders them.
+"""
+
+import itertools
+import json
+import struct
+import time
+from array import array
+from datetime import date, datetime
+
+from core.question_types import MULTIPLE_CHOICE, TEST_TYPES, TRUE_FALSE
+
+ANSWER_SKIPPED = -1
+ANSWER_TYPED = -2
+
+_RECORD_HEADER = struct.Struct("<dIBHHH")
+
+# Versions come from one process-wide counter so a fresh SessionProgress never
+# reuses a version that a cached view of an older one was keyed by.
+_versions = itertools.count(1)
+
+
+class SessionProgress:
+    """Per-group study progress, indexed by group position.
+
+    The arrays are read directly by the pages; all writes go through the
+    methods below so the running totals stay in step and ``version`` changes
+    whenever anything a page might display changes.
+    """
+
+    __slots__ = (
+        "group_names", "studied", "test_taken", "best_score", "last_attempt", "cards_viewed",
+        "studied_count", "tests_taken", "total_cards", "best_score_sum", "version",
+    )
+
+    def __init__(self, group_names):
+        n = len(group_names)
+        self.group_names = group_names
+        self.studied = bytearray(n)
+        self.test_taken = bytearray(n)
+        self.best_score = array("d", [0.0]) * n
+        self.last_attempt = array("I", [0]) * n  # date ordinal, 0 = never
+        self.cards_viewed = array("I", [0]) * n
+        # Running totals over all groups
+        self.studied_count = 0
+        self.tests_taken = 0
+        self.total_cards = 0
+        self.best_score_sum = 0.0  # over groups with a test taken
+        self.version = next(_versions)
+
+    @property
+    def average_best_score(self):
+        return self.best_score_sum / self.tests_taken if self.tests_taken else 0.0
+
+    def mark_studied(self, g):
+        if not self.studied[g]:
+            self.studied[g] = 1
+            self.studied_count += 1
+            self.version = next(_versions)
+
+    def view_card(self, g, index):
+        """Record that card ``index`` was reached; return True if that is new progress."""
+        if index > self.cards_viewed[g]:
+            self.total_cards += index - self.cards_viewed[g]
+            self.cards_viewed[g] = index
+            self.version = next(_versions)
+            return True
+        return False
+
+    def record_test(self, g, score_percent, day=None):
+        if not self.test_taken[g]:
+            self.test_taken[g] = 1
+            self.tests_taken += 1
+            self.best_score_sum += self.best_score[g]
+        if score_percent > self.best_score[g]:
+            self.best_score_sum += score_percent - self.best_score[g]
+            self.best_score[g] = score_percent
+        self.last_attempt[g] = (day or date.today()).toordinal()
+        self.version = next(_versions)
+
+    def last_attempt_str(self, g):
+        ordinal = self.last_attempt[g]
+        return date.fromordinal(ordinal).strftime("%Y-%m-%d") if ordinal else None
+
+    def group_dict(self, g):
+        """The group's progress in the export/storage dict format."""
+        return {
+            "studied": bool(self.studied[g]),
+            "test_taken": bool(self.test_taken[g]),
+            "best_score": self.best_score[g],
+            "last_attempt": self.last_attempt_str(g),
+            "cards_viewed": self.cards_viewed[g],
+        }
+
+    def load_group(self, g, data):
+        # Take the group's old values out of the totals, then add the new ones
+        self.studied_count -= self.studied[g]
+        self.tests_taken -= self.test_taken[g]
+        self.total_cards -= self.cards_viewed[g]
+        if self.test_taken[g]:
+            self.best_score_sum -= self.best_score[g]
+
+        self.studied[g] = bool(data.get("studied"))
+        self.test_taken[g] = bool(data.get("test_taken"))
+        self.best_score[g] = float(data.get("best_score") or 0)
+        last = data.get("last_attempt")
+        self.last_attempt[g] = datetime.strptime(last, "%Y-%m-%d").toordinal() if last else 0
+        self.cards_viewed[g] = int(data.get("cards_viewed") or 0)
+
+        self.studied_count += self.studied[g]
+        self.tests_taken += self.test_taken[g]
+        self.total_cards += self.cards_viewed[g]
+        if self.test_taken[g]:
+            self.best_score_sum += self.best_score[g]
+        self.version = next(_versions)
+
+    def to_dict(self):
+        return {name: self.group_dict(g) for g, name in enumerate(self.group_names)}
+
+
+class TestRecord:
+    """One test: word ids, question types and answer codes, plus its summary.
+
+    ``answers`` holds, per question, the word id of the chosen meaning
+    (multiple choice), 1/0 for True/False, ``ANSWER_TYPED`` for a typed
+    fill-in answer (text kept in ``typed``) or ``ANSWER_SKIPPED``.
+    """
+
+    __slots__ = (
+        "taken_at", "group", "test_type", "time_taken_ms", "n_correct", "n_total",
+        "word_ids", "qtypes", "shown", "answers", "correct", "latency_ms", "typed",
+    )
+
+    def __init__(self, group, test_type, word_ids=(), qtypes=b"", shown=(), taken_at=None):
+        self.taken_at = time.time() if taken_at is None else taken_at
+        self.group = group
+        self.test_type = test_type
+        self.time_taken_ms = 0
+        self.n_correct = 0
+        self.n_total = 0
+        self.word_ids = array("I", word_ids)
+        self.qtypes = bytes(qtypes)
+        self.shown = array("i", shown)
+        self.answers = array("i")
+        self.correct = bytearray()
+        self.latency_ms = array("I")
+        self.typed = None
+
+    @classmethod
+    def from_batch(cls, batch, test, group, test_type):
+        """Start a record for test number ``test`` of a :class:`core.questions.TestBatch`."""
+        return cls(
+            group, TEST_TYPES.index(test_type),
+            (int(i) for i in batch.word_ids[test]),
+            bytes(int(t) for t in batch.qtypes[test]),
+            (int(i) for i in batch.tf_shown[test]),
+        )
+
+    def add_answer(self, answer, is_correct, latency_ms=0, typed=None):
+        if typed is not None:
+            if self.typed is None:
+                self.typed = {}
+            self.typed[len(self.answers)] = typed
+            answer = ANSWER_TYPED
+        self.answers.append(answer)
+        self.correct.append(1 if is_correct else 0)
+        self.latency_ms.append(max(0, int(latency_ms)))
+        self.n_correct += bool(is_correct)
+        self.n_total += 1
+
+    def add_answers(self, answers, correct, latency_ms, typed=None):
+        """Append a whole test's answers at once; see :meth:`add_answer`.
+
+        ``typed`` maps question positions (counted from the first answer
+        added here) to fill-in text.
+        """
+        start = len(self.answers)
+        self.answers.extend(int(a) for a in answers)
+        for q, text in (typed or {}).items():
+            if self.typed is None:
+                self.typed = {}
+            self.typed[start + q] = text
+            self.answers[start + q] = ANSWER_TYPED
+        correct = bytes(1 if c else 0 for c in correct)
+        self.correct.extend(correct)
+        self.latency_ms.extend(max(0, int(ms)) for ms in latency_ms)
+        self.n_correct += sum(correct)
+        self.n_total += len(correct)
+
+    @property
+    def percentage(self):
+        return (self.n_correct / self.n_total) * 100 if self.n_total > 0 else 0
+
+    @property
+    def type_name(self):
+        return TEST_TYPES[self.test_type]
+
+    def summary(self):
+        """The display fields of a test result (date, group, score, ...)."""
+        return {
+            'date': datetime.fromtimestamp(self.taken_at).strftime("%Y-%m-%d %H:%M"),
+            'group': self.group,
+            'score': f"{self.n_correct}/{self.n_total}",
+            'percentage': self.percentage,
+            'type': self.type_name,
+            'time_taken': f"{self.time_taken_ms / 1000:.1f} seconds",
+        }
+
+    def details(self, vocab_index):
+        """Rebuild the per-question question/answer strings."""
+        from core.questions import render_question
+        records = vocab_index.records
+        rows = []
+        for q, answer in enumerate(self.answers):
+            qtype = self.qtypes[q]
+            question = render_question(vocab_index, qtype, self.word_ids[q], shown_id=self.shown[q])
+            if answer == ANSWER_SKIPPED:
+                user_answer = "Skipped"
+            elif qtype == MULTIPLE_CHOICE:
+                user_answer = records[answer]['meaning']
+            elif qtype == TRUE_FALSE:
+                user_answer = "True" if answer else "False"
+            else:
+                user_answer = (self.typed or {}).get(q, "")
+            rows.append({
+                "question": question.get("question", question.get("statement")),
+                "user_answer": user_answer,
+                "correct_answer": question["correct_answer"],
+                "is_correct": bool(self.correct[q]),
+            })
+        return rows
+
+    def to_result(self, vocab_index):
+        """The legacy export dict, including ``details``."""
+        result = self.summary()
+        result['details'] = self.details(vocab_index)
+        return result
+
+    @classmethod
+    def from_result(cls, result, vocab_index):
+        """Rebuild a record from an exported result dict (summary only)."""
+        try:
+            taken_at = datetime.strptime(result['date'], "%Y-%m-%d %H:%M").timestamp()
+        except (KeyError, ValueError):
+            taken_at = time.time()
+        test_type = result.get('type')
+        group = result.get('group')
+        # Tests across several groups keep their label
+        if group in vocab_index.group_position or not isinstance(group, str):
+            group = vocab_index.group_names[vocab_index.group_position.get(group, 0)]
+        record = cls(
+            group,
+            TEST_TYPES.index(test_type) if test_type in TEST_TYPES else 0,
+            taken_at=taken_at,
+        )
+        try:
+            record.n_correct, record.n_total = (int(x) for x in str(result.get('score', '0/0')).split('/'))
+        except ValueError:
+            pass
+        try:
+            record.time_taken_ms = round(float(str(result.get('time_taken', '0')).split()[0]) * 1000)
+        except ValueError:
+            pass
+        return record
+
+    def remapped(self, mapping):
+        """This record with word ids moved by ``mapping`` (see :meth:`core.index.VocabIndex.id_map`).
+
+        Returns None if a question's word or option is no longer in the deck.
+        """
+        def move(word_id):
+            return mapping[word_id] if 0 <= word_id < len(mapping) else -1
+
+        word_ids = [move(i) for i in self.word_ids]
+        shown = [move(i) if i >= 0 else i for i in self.shown]
+        answers = array("i", self.answers)
+        for q, answer in enumerate(self.answers):
+            # Multiple-choice answers are word ids; the other codes are not
+            if self.qtypes[q] == MULTIPLE_CHOICE and answer >= 0:
+                answers[q] = move(answer)
+                if answers[q] < 0:
+                    return None
+        if min(word_ids, default=0) < 0 or any(new < 0 <= old for old, new in zip(self.shown, shown)):
+            return None
+        record = TestRecord(self.group, self.test_type, word_ids, self.qtypes, shown, self.taken_at)
+        record.answers = answers
+        record.correct = bytearray(self.correct)
+        record.latency_ms = array("I", self.latency_ms)
+        record.typed = self.typed
+        record.time_taken_ms = self.time_taken_ms
+        record.n_correct = self.n_correct
+        record.n_total = self.n_total
+        return record
+
+    def to_bytes(self):
+        group = self.group.encode("utf-8")
+        typed = json.dumps(self.typed).encode("utf-8") if self.typed else b""
+        n = len(self.word_ids)
+        return b"".join([
+            _RECORD_HEADER.pack(self.taken_at, self.time_taken_ms, self.test_type,
+                                self.n_correct, self.n_total, len(group)),
+            group,
+            struct.pack("<II", n, len(self.answers)),
+            self.word_ids.tobytes(), self.qtypes, self.shown.tobytes(),
+            self.answers.tobytes(), bytes(self.correct), self.latency_ms.tobytes(),
+            typed,
+        ])
+
+    @classmethod
+    def from_bytes(cls, data, vocab_index=None):
+        taken_at, time_taken_ms, test_type, n_correct, n_total, group_len = _RECORD_HEADER.unpack_from(data, 0)
+        pos = _RECORD_HEADER.size
+        group = str(data[pos:pos + group_len], "utf-8")
+        if vocab_index is not None and group in vocab_index.group_position:
+            # Share the index's string object rather than keeping a copy.
+            group = vocab_index.group_names[vocab_index.group_position[group]]
+        pos += group_len
+        n, n_answers = struct.unpack_from("<II", data, pos)
+        pos += 8
+
+        def take(typecode, count):
+            nonlocal pos
+            buf = array(typecode)
+            size = buf.itemsize * count
+            buf.frombytes(data[pos:pos + size])
+            pos += size
+            return buf
+
+        record = cls(group, test_type, taken_at=taken_at)
+        record.word_ids = take("I", n)
+        record.qtypes = bytes(data[pos:pos + n])
+        pos += n
+        record.shown = take("i", n)
+        record.answers = take("i", n_answers)
+        record.correct = bytearray(data[pos:pos + n_answers])
+        pos += n_answers
+        record.latency_ms = take("I", n_answers)
+        record.typed = {int(k): v for k, v in json.loads(bytes(data[pos:])).items()} if pos < len(data) else None
+        record.time_taken_ms = time_taken_ms
+        record.n_correct = n_correct
+        record.n_total = n_total
+        return record
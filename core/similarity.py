@@ -0,0 +1,118 @@
+"""Definition-similarity neighbours for hard distractors.
+
+The ``simple`` definitions are embedded as hashed character n-gram TF-IDF
+vectors and compared with blocked matrix products. Only the top-k neighbours
+of each word are kept (``int32`` ids, ``float16`` scores), so picking a close
+distractor at test time is an O(k) row lookup.
+
+Run ``python -m core.similarity`` to precompute ``data/similarity.npz``; the
+app also builds it on first use if it is missing or out of date.
+"""
+
+import hashlib
+import os
+import zlib
+
+import numpy as np
+
+from core.store import BASE_DIR
+
+SIMILARITY_PATH = os.environ.get("GRE_SIMILARITY_PATH", os.path.join(BASE_DIR, "data", "similarity.npz"))
+DIM = 1024
+NGRAMS = (2, 3, 4)
+TOP_K = 10
+
+
+def _fingerprint(texts, dim, k):
+    h = hashlib.sha256(f"{dim}:{k}:{NGRAMS}".encode())
+    for text in texts:
+        h.update(text.encode("utf-8"))
+        h.update(b"\0")
+    return np.frombuffer(h.digest(), dtype=np.uint8)
+
+
+def definition_vectors(texts, dim=DIM):
+    """Return L2-normalised hashed char n-gram TF-IDF rows, one per text."""
+    rows = []
+    df = np.zeros(dim, dtype=np.float32)
+    for text in texts:
+        padded = f" {text.lower()} "
+        buckets = [
+            zlib.crc32(padded[i:i + n].encode("utf-8")) % dim
+            for n in NGRAMS
+            for i in range(len(padded) - n + 1)
+        ]
+        idx, counts = np.unique(np.asarray(buckets, dtype=np.int64), return_counts=True)
+        rows.append((idx, counts))
+        df[idx] += 1
+
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1
+    X = np.zeros((len(texts), dim), dtype=np.float32)
+    for r, (idx, counts) in enumerate(rows):
+        X[r, idx] = (1 + np.log(counts)) * idf[idx]
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    X /= np.maximum(norms, 1e-12)
+    return X
+
+
+def top_k_neighbors(X, k=TOP_K, block=1024):
+    """Return ``(neighbors, scores)``: each row's ``k`` most similar other rows."""
+    n = X.shape[0]
+    k = min(k, n - 1)
+    neighbors = np.empty((n, k), dtype=np.int32)
+    scores = np.empty((n, k), dtype=np.float16)
+    if k <= 0:
+        return neighbors, scores
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        S = X[start:stop] @ X.T
+        S[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        part = np.argpartition(S, -k, axis=1)[:, -k:]
+        part_scores = np.take_along_axis(S, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+        neighbors[start:stop] = np.take_along_axis(part, order, axis=1)
+        scores[start:stop] = np.take_along_axis(part_scores, order, axis=1)
+    return neighbors, scores
+
+
+class SimilarityTable:
+    """Top-k nearest definitions for every word id."""
+
+    def __init__(self, neighbors, scores):
+        self.neighbors = neighbors
+        self.scores = scores
+
+
+def build_similarity(vocab_index, k=TOP_K, dim=DIM):
+    texts = [w["simple"] for w in vocab_index.records]
+    neighbors, scores = top_k_neighbors(definition_vectors(texts, dim), k)
+    return SimilarityTable(neighbors, scores)
+
+
+def load_similarity(vocab_index, path=SIMILARITY_PATH, k=TOP_K, dim=DIM):
+    """Load precomputed neighbours, rebuilding (and saving) them when stale."""
+    fingerprint = _fingerprint((w["simple"] for w in vocab_index.records), dim, k)
+    try:
+        with np.load(path) as data:
+            if np.array_equal(data["fingerprint"], fingerprint):
+                return SimilarityTable(data["neighbors"], data["scores"])
+    except (OSError, KeyError, ValueError):
+        pass
+
+    table = build_similarity(vocab_index, k, dim)
+    try:
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, neighbors=table.neighbors, scores=table.scores, fingerprint=fingerprint)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+    return table
+
+
+if __name__ == "__main__":
+    from core.index import VocabIndex
+    from core.store import load_vocab_groups
+
+    vocab_index = VocabIndex(load_vocab_groups())
+    table = load_similarity(vocab_index)
+    print(f"Wrote {SIMILARITY_PATH}: {table.neighbors.shape[0]} words x {table.neighbors.shape[1]} neighbours")
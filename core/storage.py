@@ -0,0 +1,556 @@
+"""Persistent progress storage.
+
+Pages talk to a :class:`ProgressStore`; :class:`SQLiteProgressStore` is the
+default backend. It runs SQLite in WAL mode so readers never block the
+writer, keeps a small pool of connections per process, and buffers writes
+from every session in the process so they reach the database as a few
+batched, parameterised transactions instead of one per click.
+
+In-progress tests are checkpointed under a resume token after every
+answer, so a reconnect or restart can pick a test up where it stopped.
+Checkpoints of tests started more than ``CHECKPOINT_TTL`` seconds ago are
+treated as abandoned and deleted on startup and whenever checkpoints are
+written.
+
+Individual answers go to an append-only event log. Per-word aggregates are
+loaded from the latest snapshot plus the events after it, and a fresh
+snapshot is written once that tail grows past ``SNAPSHOT_EVERY`` events.
+
+Word ids are positions in the deck, so each user row records the deck
+fingerprint its state was written against, and every deck's word keys are
+kept. When a user first loads after the deck changed, their answer events,
+review schedule and test records are moved onto the new ids by word.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import contextmanager
+
+from core.events import AnswerEvent, WordStats
+from core.scheduler import ReviewScheduler
+from core.session_model import TestRecord
+from core.store import BASE_DIR
+
+DB_PATH = os.environ.get("GRE_VOCAB_DB", os.path.join(BASE_DIR, "data", "progress.db"))
+SNAPSHOT_EVERY = 500
+CHECKPOINT_TTL = 7 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    score INTEGER NOT NULL DEFAULT 0,
+    total_questions INTEGER NOT NULL DEFAULT 0,
+    scheduler TEXT,
+    deck TEXT
+);
+CREATE TABLE IF NOT EXISTS decks (
+    fingerprint TEXT PRIMARY KEY,
+    keys BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS group_progress (
+    user_id TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    studied INTEGER NOT NULL,
+    test_taken INTEGER NOT NULL,
+    best_score REAL NOT NULL,
+    last_attempt TEXT,
+    cards_viewed INTEGER NOT NULL,
+    PRIMARY KEY (user_id, group_name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS test_results (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    taken_at TEXT NOT NULL,
+    group_name TEXT NOT NULL,
+    score TEXT NOT NULL,
+    percentage REAL NOT NULL,
+    test_type TEXT,
+    time_taken TEXT,
+    payload BLOB
+);
+CREATE INDEX IF NOT EXISTS test_results_user ON test_results (user_id, id);
+CREATE TABLE IF NOT EXISTS answer_events (
+    user_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    word_id INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    latency_ms INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    PRIMARY KEY (user_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS word_stats_snapshots (
+    user_id TEXT PRIMARY KEY,
+    upto_seq INTEGER NOT NULL,
+    state BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_checkpoints (
+    token TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    one_page INTEGER NOT NULL,
+    options BLOB NOT NULL,
+    record BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS test_checkpoints_user ON test_checkpoints (user_id);
+CREATE INDEX IF NOT EXISTS test_checkpoints_started ON test_checkpoints (started_at);
+"""
+
+
+class ProgressStore(ABC):
+    """Interface for loading and saving a user's progress.
+
+    ``save_*`` and ``record_test`` may buffer; call :meth:`flush` to make
+    buffered writes durable.
+    """
+
+    @abstractmethod
+    def load_user(self, user_id):
+        """Return ``(score, total_questions, scheduler_dict_or_None)``."""
+
+    @abstractmethod
+    def load_progress(self, user_id):
+        """Return ``{group: progress_dict}`` for the groups the user has touched."""
+
+    @abstractmethod
+    def load_test_results(self, user_id, vocab_index):
+        """Return the user's :class:`core.session_model.TestRecord` list, oldest first."""
+
+    @abstractmethod
+    def save_group_progress(self, user_id, group, data):
+        ...
+
+    @abstractmethod
+    def save_totals(self, user_id, score, total_questions):
+        ...
+
+    @abstractmethod
+    def save_scheduler(self, user_id, scheduler_dict):
+        ...
+
+    @abstractmethod
+    def record_test(self, user_id, record):
+        """Append a finished :class:`core.session_model.TestRecord`."""
+
+    @abstractmethod
+    def append_events(self, user_id, events):
+        """Append :class:`core.events.AnswerEvent` records to the user's log."""
+
+    @abstractmethod
+    def load_word_stats(self, user_id, n_words):
+        """Return the user's :class:`core.events.WordStats`."""
+
+    @abstractmethod
+    def load_latencies(self, user_id):
+        """Return ``(word_ids, latency_ms)`` arrays of the user's timed answers, oldest first."""
+
+    @abstractmethod
+    def save_checkpoint(self, token, user_id, checkpoint):
+        """Store an in-progress test under ``token``; the latest save wins.
+
+        ``checkpoint`` has ``started_at``, ``one_page``, ``options`` (bytes)
+        and ``record`` (:meth:`core.session_model.TestRecord.to_bytes`).
+        """
+
+    @abstractmethod
+    def load_checkpoint(self, token):
+        """Return the checkpoint saved under ``token`` plus its ``user_id``, or None."""
+
+    @abstractmethod
+    def delete_checkpoint(self, token):
+        ...
+
+    @abstractmethod
+    def reset_user(self, user_id):
+        ...
+
+    def flush(self):
+        pass
+
+
+class SQLiteProgressStore(ProgressStore):
+    """SQLite backend shared by every session in the process."""
+
+    def __init__(self, path=DB_PATH, pool_size=4, flush_threshold=256, vocab_index=None):
+        self.path = path
+        self.flush_threshold = flush_threshold
+        self.vocab_index = vocab_index
+        self.deck = vocab_index.fingerprint if vocab_index is not None else None
+        self._deck_checked = set()
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(test_results)")}
+            if "payload" not in columns:
+                conn.execute("ALTER TABLE test_results ADD COLUMN payload BLOB")
+            if "deck" not in {row[1] for row in conn.execute("PRAGMA table_info(users)")}:
+                conn.execute("ALTER TABLE users ADD COLUMN deck TEXT")
+            if self.deck is not None:
+                conn.execute(
+                    "INSERT OR IGNORE INTO decks (fingerprint, keys) VALUES (?, ?)",
+                    (self.deck, zlib.compress("\n".join(vocab_index.keys).encode("utf-8"))),
+                )
+            self._prune_checkpoints(conn)
+
+        # Pending writes from all sessions, coalesced by key where the
+        # latest value wins.
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._groups = {}
+        self._totals = {}
+        self._schedulers = {}
+        self._tests = []
+        self._events = {}
+        self._checkpoints = {}  # token -> row, or None to delete
+
+    def _prune_checkpoints(self, conn):
+        """Delete checkpoints of tests started more than ``CHECKPOINT_TTL`` seconds ago."""
+        conn.execute("DELETE FROM test_checkpoints WHERE started_at < ?", (time.time() - CHECKPOINT_TTL,))
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    # Deck changes
+
+    def _check_deck(self, user_id):
+        """Move the user's state onto the current deck if it was saved against another."""
+        if self.deck is None or user_id in self._deck_checked:
+            return
+        with self._write_lock, self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT deck FROM users WHERE user_id = ?", (user_id,)).fetchone()
+                # Rows from before decks were recorded are taken to match
+                if row is not None and row[0] not in (None, self.deck):
+                    keys = conn.execute("SELECT keys FROM decks WHERE fingerprint = ?", (row[0],)).fetchone()
+                    mapping = (
+                        self.vocab_index.id_map(zlib.decompress(keys[0]).decode("utf-8").split("\n"))
+                        if keys is not None else array("i")
+                    )
+                    self._remap_user(conn, user_id, mapping)
+                if row is not None and row[0] != self.deck:
+                    conn.execute("UPDATE users SET deck = ? WHERE user_id = ?", (self.deck, user_id))
+        self._deck_checked.add(user_id)
+
+    def _remap_user(self, conn, user_id, mapping):
+        def move(word_id):
+            return mapping[word_id] if 0 <= word_id < len(mapping) else -1
+
+        events = conn.execute("SELECT seq, word_id FROM answer_events WHERE user_id = ?", (user_id,)).fetchall()
+        conn.executemany(
+            "UPDATE answer_events SET word_id = ? WHERE user_id = ? AND seq = ?",
+            [(move(word_id), user_id, seq) for seq, word_id in events if move(word_id) >= 0],
+        )
+        conn.executemany(
+            "DELETE FROM answer_events WHERE user_id = ? AND seq = ?",
+            [(user_id, seq) for seq, word_id in events if move(word_id) < 0],
+        )
+        # Snapshots are rebuilt from the moved events; checkpoints are dropped
+        conn.execute("DELETE FROM word_stats_snapshots WHERE user_id = ?", (user_id,))
+        conn.execute("DELETE FROM test_checkpoints WHERE user_id = ?", (user_id,))
+
+        (scheduler,) = conn.execute("SELECT scheduler FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        if scheduler:
+            try:
+                moved = ReviewScheduler.from_dict(json.loads(scheduler)).remapped(mapping, self.vocab_index.total_words)
+                scheduler = json.dumps(moved.to_dict())
+            except (KeyError, ValueError):
+                scheduler = None
+            conn.execute("UPDATE users SET scheduler = ? WHERE user_id = ?", (scheduler, user_id))
+
+        # A test whose words are gone keeps only its summary columns
+        for test_id, payload in conn.execute(
+            "SELECT id, payload FROM test_results WHERE user_id = ? AND payload IS NOT NULL", (user_id,)
+        ).fetchall():
+            record = TestRecord.from_bytes(payload).remapped(mapping)
+            conn.execute(
+                "UPDATE test_results SET payload = ? WHERE id = ?",
+                (record.to_bytes() if record is not None else None, test_id),
+            )
+
+    # Reads
+
+    def load_user(self, user_id):
+        self.flush()
+        self._check_deck(user_id)
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT score, total_questions, scheduler FROM users WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        if row is None:
+            return 0, 0, None
+        score, total_questions, scheduler = row
+        return score, total_questions, json.loads(scheduler) if scheduler else None
+
+    def load_progress(self, user_id):
+        self.flush()
+        self._check_deck(user_id)
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT group_name, studied, test_taken, best_score, last_attempt, cards_viewed "
+                "FROM group_progress WHERE user_id = ?",
+                (user_id,),
+            ).fetchall()
+        return {
+            group: {
+                "studied": bool(studied),
+                "test_taken": bool(test_taken),
+                "best_score": best_score,
+                "last_attempt": last_attempt,
+                "cards_viewed": cards_viewed,
+            }
+            for group, studied, test_taken, best_score, last_attempt, cards_viewed in rows
+        }
+
+    def load_test_results(self, user_id, vocab_index):
+        self.flush()
+        self._check_deck(user_id)
+        with self._connection() as conn:
+            rows = conn.execute(
+                "SELECT taken_at, group_name, score, test_type, time_taken, payload "
+                "FROM test_results WHERE user_id = ? ORDER BY id",
+                (user_id,),
+            ).fetchall()
+        records = []
+        for taken_at, group, score, test_type, time_taken, payload in rows:
+            if payload is not None:
+                records.append(TestRecord.from_bytes(payload, vocab_index))
+            else:
+                records.append(TestRecord.from_result(
+                    {"date": taken_at, "group": group, "score": score, "type": test_type, "time_taken": time_taken},
+                    vocab_index,
+                ))
+        return records
+
+    def load_word_stats(self, user_id, n_words):
+        self.flush()
+        self._check_deck(user_id)
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT upto_seq, state FROM word_stats_snapshots WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            stats, upto = None, 0
+            if row is not None:
+                try:
+                    stats = WordStats.from_bytes(row[1])
+                    upto = row[0]
+                except ValueError:
+                    stats = None
+            if stats is None or stats.n_words != n_words:
+                stats, upto = WordStats(n_words), 0
+
+            tail = conn.execute(
+                "SELECT seq, word_id, correct, latency_ms, ts FROM answer_events "
+                "WHERE user_id = ? AND seq > ? ORDER BY seq",
+                (user_id, upto),
+            ).fetchall()
+        for seq, word_id, correct, latency_ms, ts in tail:
+            stats.apply(AnswerEvent(word_id, correct, latency_ms, ts))
+
+        if len(tail) >= SNAPSHOT_EVERY:
+            with self._write_lock, self._connection() as conn:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.execute(
+                        "INSERT OR REPLACE INTO word_stats_snapshots (user_id, upto_seq, state) VALUES (?, ?, ?)",
+                        (user_id, tail[-1][0], stats.to_bytes()),
+                    )
+        return stats
+
+    def load_latencies(self, user_id):
+        self.flush()
+        self._check_deck(user_id)
+        word_ids, latency_ms = array("I"), array("I")
+        with self._connection() as conn:
+            # Answers without a measured time (one-page tests, resumed questions) are stored as 0
+            for word_id, ms in conn.execute(
+                "SELECT word_id, latency_ms FROM answer_events WHERE user_id = ? AND latency_ms > 0 ORDER BY seq",
+                (user_id,),
+            ):
+                word_ids.append(word_id)
+                latency_ms.append(ms)
+        return word_ids, latency_ms
+
+    def load_checkpoint(self, token):
+        self.flush()
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT user_id, started_at, one_page, options, record FROM test_checkpoints "
+                "WHERE token = ? AND started_at >= ?",
+                (token, time.time() - CHECKPOINT_TTL),
+            ).fetchone()
+        if row is None:
+            return None
+        user_id, started_at, one_page, options, record = row
+        return {
+            "user_id": user_id,
+            "started_at": started_at,
+            "one_page": bool(one_page),
+            "options": options,
+            "record": record,
+        }
+
+    # Buffered writes
+
+    def _pending(self):
+        return (len(self._groups) + len(self._totals) + len(self._schedulers) + len(self._tests)
+                + len(self._checkpoints) + sum(len(events) for events in self._events.values()))
+
+    def _queued(self):
+        if self._pending() >= self.flush_threshold:
+            self.flush()
+
+    def save_group_progress(self, user_id, group, data):
+        with self._lock:
+            self._groups[(user_id, group)] = (
+                user_id, group, int(data["studied"]), int(data["test_taken"]),
+                data["best_score"], data["last_attempt"], data["cards_viewed"],
+            )
+        self._queued()
+
+    def save_totals(self, user_id, score, total_questions):
+        with self._lock:
+            self._totals[user_id] = (user_id, score, total_questions)
+        self._queued()
+
+    def save_scheduler(self, user_id, scheduler_dict):
+        with self._lock:
+            self._schedulers[user_id] = (user_id, json.dumps(scheduler_dict))
+        self._queued()
+
+    def record_test(self, user_id, record):
+        with self._lock:
+            self._tests.append((user_id, record))
+        self._queued()
+
+    def append_events(self, user_id, events):
+        with self._lock:
+            self._events.setdefault(user_id, []).extend(events)
+        self._queued()
+
+    def save_checkpoint(self, token, user_id, checkpoint):
+        with self._lock:
+            self._checkpoints[token] = (
+                token, user_id, checkpoint["started_at"], int(checkpoint["one_page"]),
+                checkpoint["options"], checkpoint["record"],
+            )
+        self._queued()
+
+    def delete_checkpoint(self, token):
+        with self._lock:
+            self._checkpoints[token] = None
+        self._queued()
+
+    def reset_user(self, user_id):
+        with self._lock:
+            self._checkpoints = {
+                token: row for token, row in self._checkpoints.items() if row is None or row[1] != user_id
+            }
+            self._events.pop(user_id, None)
+            self._groups = {k: v for k, v in self._groups.items() if k[0] != user_id}
+            self._totals.pop(user_id, None)
+            self._schedulers.pop(user_id, None)
+            self._tests = [t for t in self._tests if t[0] != user_id]
+        with self._write_lock, self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for table in ("test_results", "group_progress", "users", "answer_events", "word_stats_snapshots",
+                              "test_checkpoints"):
+                    conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+
+    def flush(self):
+        """Write every buffered change in a single transaction."""
+        # Holding the write lock while swapping the buffers keeps concurrent
+        # flushes from committing older values after newer ones.
+        with self._write_lock:
+            with self._lock:
+                if not self._pending():
+                    return
+                groups, self._groups = list(self._groups.values()), {}
+                totals, self._totals = list(self._totals.values()), {}
+                schedulers, self._schedulers = list(self._schedulers.values()), {}
+                tests, self._tests = self._tests, []
+                events, self._events = self._events, {}
+                checkpoints, self._checkpoints = self._checkpoints, {}
+            self._write(groups, totals, schedulers, tests, events, checkpoints)
+
+    def _write(self, groups, totals, schedulers, tests, events, checkpoints):
+        users = {row[0] for row in totals} | {row[0] for row in schedulers} | {row[0] for row in groups}
+        users.update(user_id for user_id, _ in tests)
+
+        with self._connection() as conn:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO users (user_id, deck) VALUES (?, ?)", [(u, self.deck) for u in users]
+                )
+                conn.executemany(
+                    "UPDATE users SET score = ?, total_questions = ? WHERE user_id = ?",
+                    [(score, total, user_id) for user_id, score, total in totals],
+                )
+                conn.executemany(
+                    "UPDATE users SET scheduler = ? WHERE user_id = ?",
+                    [(state, user_id) for user_id, state in schedulers],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO group_progress "
+                    "(user_id, group_name, studied, test_taken, best_score, last_attempt, cards_viewed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    groups,
+                )
+                rows = []
+                for user_id, record in tests:
+                    summary = record.summary()
+                    rows.append((
+                        user_id, summary["date"], summary["group"], summary["score"],
+                        summary["percentage"], summary["type"], summary["time_taken"], record.to_bytes(),
+                    ))
+                conn.executemany(
+                    "INSERT INTO test_results "
+                    "(user_id, taken_at, group_name, score, percentage, test_type, time_taken, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                for user_id, user_events in events.items():
+                    (last_seq,) = conn.execute(
+                        "SELECT COALESCE(MAX(seq), 0) FROM answer_events WHERE user_id = ?", (user_id,)
+                    ).fetchone()
+                    conn.executemany(
+                        "INSERT INTO answer_events (user_id, seq, word_id, correct, latency_ms, ts) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        [
+                            (user_id, last_seq + i, e.word_id, int(e.correct), int(e.latency_ms), e.ts)
+                            for i, e in enumerate(user_events, 1)
+                        ],
+                    )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO test_checkpoints "
+                    "(token, user_id, started_at, one_page, options, record) VALUES (?, ?, ?, ?, ?, ?)",
+                    [row for row in checkpoints.values() if row is not None],
+                )
+                conn.executemany(
+                    "DELETE FROM test_checkpoints WHERE token = ?",
+                    [(token,) for token, row in checkpoints.items() if row is None],
+                )
+                if checkpoints:
+                    self._prune_checkpoints(conn)
@@ -0,0 +1,290 @@
+"""Compiled binary vocabulary store.
+
+``data/vocab_data.py`` stays the source of truth; this module compiles its
+``vocab_groups`` into a versioned, memory-mappable artifact so worker
+processes can skip importing (and building 1,000+ dicts from) the Python
+literal on every start.
+
+Layout (all integers little-endian ``u32``)::
+
+    header          magic, version, n_groups, n_words, n_strings, blob_size,
+                    sha256 of the source module
+    str_offsets     n_strings + 1 byte offsets into the string blob
+    group_names     n_groups string ids
+    group_offsets   n_groups + 1 word offsets (group g owns words [o[g], o[g+1]))
+    word            n_words string ids
+    simple          n_words string ids
+    meaning         n_words string ids
+    blob            UTF-8 bytes of every distinct string, stored once
+
+Run ``python -m core.store`` to (re)build the artifact. Setting
+``GRE_VOCAB_STORE`` makes the app serve another prebuilt store instead.
+"""
+
+import functools
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_PATH = os.path.join(BASE_DIR, "data", "vocab_data.py")
+STORE_PATH = os.path.join(BASE_DIR, "data", "vocab_store.bin")
+# A prebuilt store to serve instead, as-is (e.g. a synthetic benchmark deck)
+STORE_OVERRIDE = os.environ.get("GRE_VOCAB_STORE")
+
+MAGIC = b"GREVOCAB"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIII32s")
+FIELDS = ("word", "simple", "meaning")
+
+
+def _u32_bytes(values):
+    arr = array("I", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def source_digest(path=SOURCE_PATH):
+    """Return the sha256 of the source module, or ``None`` if it is missing."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).digest()
+    except OSError:
+        return None
+
+
+def build_store(vocab_groups, path=STORE_PATH, digest=None):
+    """Compile ``vocab_groups`` into a store file at ``path``."""
+    strings = {}
+
+    def intern(s):
+        sid = strings.get(s)
+        if sid is None:
+            sid = strings[s] = len(strings)
+        return sid
+
+    group_names = []
+    group_offsets = [0]
+    columns = {field: [] for field in FIELDS}
+    for group, words in vocab_groups.items():
+        group_names.append(intern(group))
+        for w in words:
+            for field in FIELDS:
+                columns[field].append(intern(w[field]))
+        group_offsets.append(len(columns["word"]))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    str_offsets = [0]
+    for b in encoded:
+        str_offsets.append(str_offsets[-1] + len(b))
+    blob = b"".join(encoded)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, len(group_names), group_offsets[-1], len(encoded),
+        len(blob), digest or b"\0" * 32,
+    )
+    payload = b"".join([
+        header,
+        _u32_bytes(str_offsets),
+        _u32_bytes(group_names),
+        _u32_bytes(group_offsets),
+        *(_u32_bytes(columns[field]) for field in FIELDS),
+        blob,
+    ])
+
+    # Write to a temp file and swap it in so concurrent workers never map a
+    # half-written store.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return path
+
+
+class VocabStore:
+    """Read-only view over a compiled store buffer.
+
+    Strings are decoded on first access and cached by id, so every repeated
+    string (e.g. a shared definition) is a single Python object.
+    """
+
+    def __init__(self, buf):
+        if len(buf) < HEADER.size:
+            raise ValueError("vocabulary store is truncated")
+        magic, version, n_groups, n_words, n_strings, blob_size, digest = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a vocabulary store")
+        if version != VERSION:
+            raise ValueError(f"unsupported vocabulary store version {version}")
+
+        n_ints = (n_strings + 1) + n_groups + (n_groups + 1) + len(FIELDS) * n_words
+        blob_start = HEADER.size + 4 * n_ints
+        if len(buf) != blob_start + blob_size:
+            raise ValueError("vocabulary store is truncated")
+
+        ints = memoryview(buf)[HEADER.size:blob_start]
+        if sys.byteorder == "big":
+            swapped = array("I", bytes(ints))
+            swapped.byteswap()
+            ints = memoryview(swapped)
+        else:
+            ints = ints.cast("I")
+
+        self._buf = buf
+        self._blob = memoryview(buf)[blob_start:]
+        self.n_groups = n_groups
+        self.n_words = n_words
+        self.source_digest = digest
+
+        pos = 0
+        self._str_offsets = ints[pos:pos + n_strings + 1]
+        pos += n_strings + 1
+        self._group_names = ints[pos:pos + n_groups]
+        pos += n_groups
+        self.group_offsets = ints[pos:pos + n_groups + 1]
+        pos += n_groups + 1
+        self._columns = {}
+        for field in FIELDS:
+            self._columns[field] = ints[pos:pos + n_words]
+            pos += n_words
+
+        self._strings = [None] * n_strings
+        self.group_names = tuple(self.string(sid) for sid in self._group_names)
+        self.groups = GroupsView(self)
+
+    @classmethod
+    def open(cls, path=STORE_PATH):
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buf)
+
+    def string(self, sid):
+        s = self._strings[sid]
+        if s is None:
+            start, end = self._str_offsets[sid], self._str_offsets[sid + 1]
+            s = self._strings[sid] = str(self._blob[start:end], "utf-8")
+        return s
+
+    def string_id(self, field, word_id):
+        """Return the interned string id of ``field`` for a word."""
+        return self._columns[field][word_id]
+
+    def field(self, field, word_id):
+        return self.string(self._columns[field][word_id])
+
+
+class WordView(Mapping):
+    """A single word record, shaped like the ``{"word", "simple", "meaning"}`` dicts."""
+
+    __slots__ = ("_store", "word_id")
+
+    def __init__(self, store, word_id):
+        self._store = store
+        self.word_id = word_id
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return self._store.field(key, self.word_id)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class GroupView(Sequence):
+    """The word list of one group."""
+
+    def __init__(self, store, start, stop):
+        self._store = store
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("group index out of range")
+        return WordView(self._store, self._start + index)
+
+
+class GroupsView(Mapping):
+    """Group name -> word list, a drop-in for ``vocab_groups``."""
+
+    def __init__(self, store):
+        self._store = store
+        self._index = {name: i for i, name in enumerate(store.group_names)}
+        self._cache = {}
+
+    def __getitem__(self, group):
+        view = self._cache.get(group)
+        if view is None:
+            g = self._index[group]
+            offsets = self._store.group_offsets
+            view = self._cache[group] = GroupView(self._store, offsets[g], offsets[g + 1])
+        return view
+
+    def __iter__(self):
+        return iter(self._store.group_names)
+
+    def __len__(self):
+        return self._store.n_groups
+
+
+def open_store(path=STORE_PATH, source=SOURCE_PATH):
+    """Open the compiled store, rebuilding it first if it is missing or stale.
+
+    Raises ``ImportError`` when neither a usable store nor the source module
+    is available.
+    """
+    digest = source_digest(source)
+    try:
+        store = VocabStore.open(path)
+        if digest is None or store.source_digest == digest:
+            return store
+    except (OSError, ValueError):
+        if digest is None:
+            raise ImportError(f"no vocabulary store at {path} and no source module")
+
+    from data.vocab_data import vocab_groups
+
+    try:
+        build_store(vocab_groups, path, digest)
+    except OSError:
+        # Read-only deployment: build into the temp dir instead.
+        path = build_store(vocab_groups, os.path.join(tempfile.gettempdir(), "gre_vocab_store.bin"), digest)
+    return VocabStore.open(path)
+
+
+@functools.lru_cache(maxsize=None)
+def load_vocab_groups(path=STORE_PATH, source=SOURCE_PATH):
+    """Return the ``vocab_groups`` view, opened once per process."""
+    if STORE_OVERRIDE:
+        return VocabStore.open(STORE_OVERRIDE).groups
+    return open_store(path, source).groups
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, BASE_DIR)
+    from data.vocab_data import vocab_groups
+
+    out = build_store(vocab_groups, STORE_PATH, source_digest())
+    store = VocabStore.open(out)
+    print(f"Wrote {out}: {store.n_groups} groups, {store.n_words} words, "
+          f"{os.path.getsize(out)} bytes")
@@ -0,0 +1,72 @@
+"""Distractor invariants of the question bank and generated tests."""
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_vocab
+from core.bank import build_bank
+from core.distractors import DistractorPool
+from core.index import VocabIndex
+from core.question_types import DIFFICULTIES, MULTIPLE_CHOICE, TRUE_FALSE
+from core.questions import generate_tests
+from core.similarity import build_similarity
+
+
+@pytest.fixture(scope="module")
+def deck():
+    vocab_groups = synthetic_vocab(300, words_per_group=30)
+    # Every word shares one simple definition and one of two meanings
+    vocab_groups["Dup"] = [{"word": f"dup{i}", "simple": "same", "meaning": f"m{i % 2}"} for i in range(6)]
+    vocab_index = VocabIndex(vocab_groups)
+    pool = DistractorPool(vocab_index)
+    return vocab_index, pool, build_similarity(vocab_index)
+
+
+def _values(pool, field):
+    return np.frombuffer(pool.value_ids(field), dtype=np.uint32)
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_bank_options_unique_and_correct(deck, difficulty):
+    vocab_index, pool, similarity = deck
+    meaning, simple = _values(pool, "meaning"), _values(pool, "simple")
+    bank = build_bank(vocab_index, pool, difficulty, similarity)
+    for word_id in range(vocab_index.total_words):
+        for v in range(bank.variants):
+            options = [i for i in bank.options[word_id, v] if i >= 0]
+            values = [meaning[i] for i in options]
+            assert len(set(values)) == len(values), (word_id, options)
+            assert options[bank.correct[word_id, v]] == word_id
+            assert values.count(meaning[word_id]) == 1
+            false = bank.tf_false[word_id, v]
+            assert false == -1 or simple[false] != simple[word_id]
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_generated_options_unique_and_correct(deck, difficulty):
+    vocab_index, pool, similarity = deck
+    meaning, simple = _values(pool, "meaning"), _values(pool, "simple")
+    for groups in (["Dup"], [vocab_index.group_names[0], "Dup"]):
+        batch = generate_tests(
+            groups, "Mixed Questions", 10, n_tests=20, seed=1, difficulty=difficulty,
+            vocab_index=vocab_index, distractor_pool=pool, similarity=similarity,
+        )
+        for t in range(batch.n_tests):
+            for q in range(batch.n_questions):
+                word_id = batch.word_ids[t, q]
+                if batch.qtypes[t, q] == MULTIPLE_CHOICE:
+                    options = [i for i in batch.options[t, q] if i >= 0]
+                    values = [meaning[i] for i in options]
+                    assert len(set(values)) == len(values), (groups, options)
+                    assert options[batch.correct_option[t, q]] == word_id
+                    assert values.count(meaning[word_id]) == 1
+                elif batch.qtypes[t, q] == TRUE_FALSE and not batch.tf_true[t, q]:
+                    assert simple[batch.tf_shown[t, q]] != simple[word_id]
+
+
+def test_single_definition_deck_has_no_false_statements():
+    vocab_index = VocabIndex({"G": [{"word": f"w{i}", "simple": "x", "meaning": f"m{i}"} for i in range(5)]})
+    pool = DistractorPool(vocab_index)
+    batch = generate_tests(["G"], "True/False", 5, seed=0, vocab_index=vocab_index, distractor_pool=pool)
+    assert batch.tf_true.all()
+    assert (build_bank(vocab_index, pool, "Medium").tf_false == -1).all()
@@ -0,0 +1,45 @@
+"""ReviewScheduler serialisation."""
+
+import json
+
+from core.scheduler import ReviewScheduler
+
+NOW = 1_700_000_000.0
+
+
+def _reviewed():
+    scheduler = ReviewScheduler(50, new_per_day=5)
+    for word_id, grade in ((0, 5), (1, 2), (2, 4), (0, 3), (7, 1)):
+        scheduler.review(word_id, grade, now=NOW)
+    return scheduler
+
+
+def test_round_trip_keeps_state():
+    scheduler = _reviewed()
+    restored = ReviewScheduler.from_dict(json.loads(json.dumps(scheduler.to_dict())))
+    assert restored.n_words == scheduler.n_words
+    assert restored.new_per_day == scheduler.new_per_day
+    assert restored.reviews == scheduler.reviews
+    for name in ("ease", "interval", "due", "reps", "lapses"):
+        assert getattr(restored, name) == getattr(scheduler, name), name
+    assert restored.to_dict() == scheduler.to_dict()
+
+
+def test_round_trip_keeps_queue():
+    scheduler = _reviewed()
+    restored = ReviewScheduler.from_dict(scheduler.to_dict())
+    for now in (NOW, NOW + 600, NOW + 86400 * 2, NOW + 86400 * 30):
+        assert restored.next_card(now) == scheduler.next_card(now), now
+        assert restored.next_due_time() == scheduler.next_due_time()
+
+
+def test_remapped_moves_cards():
+    scheduler = _reviewed()
+    # Words 0 and 3 swap, word 1 is dropped and the rest stay put
+    mapping = [3, -1, 2, 0] + list(range(4, 50))
+    moved = scheduler.remapped(mapping, 51)
+    assert moved.n_words == 51
+    assert moved.due[3] == scheduler.due[0]
+    assert moved.reps[3] == scheduler.reps[0]
+    assert moved.due[7] == scheduler.due[7]
+    assert moved.lapses[1] == 0 and moved.due[1] == 0.0
@@ -0,0 +1,78 @@
+"""SearchIndex results against a brute-force substring scan."""
+
+import random
+
+import pytest
+
+from benchmarks.synthetic import synthetic_vocab
+from core.index import VocabIndex
+from core.search import build_search_index, load_search_index
+
+
+@pytest.fixture(scope="module")
+def vocab_index():
+    vocab_groups = synthetic_vocab(600, words_per_group=30)
+    vocab_groups["Mixed"] = [
+        {"word": "Résumé", "simple": "a CV", "meaning": "জীবনবৃত্তান্ত"},
+        {"word": "résumé", "simple": "to begin again", "meaning": "আবার শুরু"},
+        {"word": "a", "simple": "b", "meaning": "c"},
+    ]
+    return VocabIndex(vocab_groups)
+
+
+@pytest.fixture(scope="module")
+def index(vocab_index):
+    return build_search_index(vocab_index)
+
+
+def _scan(vocab_index, query, ids):
+    q = query.strip().lower()
+    records = vocab_index.records
+    return [i for i in ids if any(q in records[i][field].lower() for field in ("word", "simple", "meaning"))]
+
+
+def _queries(vocab_index):
+    rng = random.Random(0)
+    queries = ["", "  ", "a", "RÉS", "résumé ", "জীবন", "zzzz", "\x00", "e\x00a"]
+    for _ in range(200):
+        w = rng.choice(vocab_index.records)
+        text = rng.choice((w["word"], w["simple"], w["meaning"]))
+        start = rng.randrange(len(text))
+        queries.append(text[start:start + rng.randint(1, 8)])
+    return queries
+
+
+def test_search_and_count_match_scan(vocab_index, index):
+    everything = range(vocab_index.total_words)
+    for query in _queries(vocab_index):
+        expected = _scan(vocab_index, query, everything)
+        assert index.search(query) == expected, query
+        assert index.count(query) == len(expected), query
+        assert index.search(query, limit=3) == expected[:3], query
+
+
+def test_group_search_matches_scan(vocab_index, index):
+    for group in (vocab_index.group_names[0], vocab_index.group_names[7], "Mixed"):
+        scope = vocab_index.group_range(group)
+        for query in _queries(vocab_index)[:60]:
+            expected = _scan(vocab_index, query, scope)
+            assert index.search(query, group=group) == expected, (group, query)
+            assert index.count(query, group=group) == len(expected), (group, query)
+
+
+def test_prefix_matches_scan(vocab_index, index):
+    lowered = sorted((w.lower(), i) for i, w in enumerate(vocab_index.words))
+    for query in ("", "a", "ré", "RÉSUMÉ", "ba", "zz", vocab_index.words[100][:4]):
+        q = query.strip().lower()
+        expected = [i for w, i in lowered if w.startswith(q)]
+        assert index.prefix(query) == expected, query
+        assert index.prefix_count(query) == len(expected), query
+        assert index.prefix(query, limit=2) == expected[:2], query
+
+
+def test_saved_index_matches_built(vocab_index, index, tmp_path):
+    path = str(tmp_path / "search_index.npz")
+    load_search_index(vocab_index, path)
+    loaded = load_search_index(vocab_index, path)
+    for query in _queries(vocab_index)[:60]:
+        assert loaded.search(query) == index.search(query), query
@@ -0,0 +1,43 @@
+"""TestRecord serialisation."""
+
+from core.question_types import FILL_BLANK, MULTIPLE_CHOICE, TRUE_FALSE
+# Imported through its module so pytest does not collect TestRecord as a test class
+from core import session_model
+
+
+def _record():
+    qtypes = bytes([MULTIPLE_CHOICE, FILL_BLANK, TRUE_FALSE, MULTIPLE_CHOICE])
+    record = session_model.TestRecord("Group ধ 1", 3, [4, 9, 2, 17], qtypes, [-1, -1, 5, -1], taken_at=1_700_000_000)
+    record.add_answer(11, False, latency_ms=2300)
+    record.add_answer(-1, True, latency_ms=0, typed="Ébullient")
+    record.add_answer(0, True, latency_ms=950)
+    record.add_answer(17, True, latency_ms=4100)
+    record.time_taken_ms = 7350
+    return record
+
+
+def _assert_same(restored, record):
+    for name in ("taken_at", "group", "test_type", "time_taken_ms", "n_correct", "n_total",
+                 "word_ids", "qtypes", "shown", "answers", "correct", "latency_ms", "typed"):
+        assert getattr(restored, name) == getattr(record, name), name
+
+
+def test_round_trip():
+    record = _record()
+    restored = session_model.TestRecord.from_bytes(record.to_bytes())
+    _assert_same(restored, record)
+    assert restored.summary() == record.summary()
+    assert restored.to_bytes() == record.to_bytes()
+
+
+def test_round_trip_without_typed_answers():
+    record = session_model.TestRecord("G", 0, [1, 2], bytes([MULTIPLE_CHOICE, MULTIPLE_CHOICE]), [-1, -1], taken_at=5)
+    record.add_answer(1, True, latency_ms=10)
+    restored = session_model.TestRecord.from_bytes(record.to_bytes())
+    _assert_same(restored, record)
+    assert restored.typed is None
+
+
+def test_round_trip_of_unanswered_record():
+    record = session_model.TestRecord("G", 1, [3, 4], bytes([FILL_BLANK, FILL_BLANK]), [-1, -1], taken_at=5)
+    _assert_same(session_model.TestRecord.from_bytes(record.to_bytes()), record)
@@ -0,0 +1,88 @@
+"""SQLiteProgressStore moving a user's state onto a changed deck."""
+
+from core import session_model
+from core.events import AnswerEvent
+from core.index import VocabIndex
+from core.question_types import MULTIPLE_CHOICE
+from core.scheduler import ReviewScheduler
+from core.storage import SQLiteProgressStore
+
+NOW = 1_700_000_000.0
+
+
+def _word(word):
+    return {"word": word, "simple": f"{word} simple", "meaning": f"{word} meaning"}
+
+
+def _decks():
+    old = VocabIndex({"A": [_word("alpha"), _word("beta"), _word("gamma")], "B": [_word("delta"), _word("omega")]})
+    # "new" is inserted ahead of gamma, omega is removed and delta moves to group A
+    new = VocabIndex({"A": [_word("alpha"), _word("new"), _word("beta"), _word("gamma"), _word("delta")], "B": []})
+    return old, new
+
+
+def _ids(vocab_index, *words):
+    return [vocab_index.words.index(w) for w in words]
+
+
+def _record(vocab_index, words, answer):
+    word_ids = _ids(vocab_index, *words)
+    record = session_model.TestRecord("A", 0, word_ids, bytes([MULTIPLE_CHOICE]) * len(word_ids), [-1] * len(word_ids), taken_at=1)
+    for word_id in word_ids:
+        record.add_answer(_ids(vocab_index, answer)[0] if word_id == word_ids[0] else word_id, True, 100)
+    return record
+
+
+def test_deck_change_remaps_user_state(tmp_path):
+    old, new = _decks()
+    path = str(tmp_path / "progress.db")
+
+    store = SQLiteProgressStore(path, vocab_index=old)
+    gamma, delta, omega = _ids(old, "gamma", "delta", "omega")
+    store.append_events("u", [
+        AnswerEvent(gamma, True, 1200, NOW), AnswerEvent(delta, False, 800, NOW), AnswerEvent(omega, True, 500, NOW),
+    ])
+    scheduler = ReviewScheduler(old.total_words)
+    scheduler.review(gamma, 5, now=NOW)
+    scheduler.review(omega, 1, now=NOW)
+    store.save_scheduler("u", scheduler.to_dict())
+    store.record_test("u", _record(old, ("gamma", "delta"), "beta"))
+    store.record_test("u", _record(old, ("alpha", "omega"), "alpha"))
+    store.flush()
+
+    store = SQLiteProgressStore(path, vocab_index=new)
+    gamma_new, delta_new, beta_new = _ids(new, "gamma", "delta", "beta")
+
+    stats = store.load_word_stats("u", new.total_words)
+    assert stats.events == 2
+    assert stats.attempts[gamma_new] == 1 and stats.correct[gamma_new] == 1
+    assert stats.attempts[delta_new] == 1 and stats.correct[delta_new] == 0
+    assert sum(stats.attempts) == 2
+
+    _, _, state = store.load_user("u")
+    moved = ReviewScheduler.from_dict(state)
+    assert moved.n_words == new.total_words
+    assert moved.due[gamma_new] == scheduler.due[gamma]
+    assert moved.reps[gamma_new] == 1
+    assert sum(1 for due in moved.due if due) == 1
+
+    kept, dropped = store.load_test_results("u", new)
+    assert list(kept.word_ids) == [gamma_new, delta_new]
+    assert list(kept.answers) == [beta_new, delta_new]
+    # A test with a removed word keeps its summary but loses its questions
+    assert dropped.summary()["score"] == "2/2"
+    assert len(dropped.word_ids) == 0
+
+
+def test_same_deck_is_left_alone(tmp_path):
+    old, _ = _decks()
+    path = str(tmp_path / "progress.db")
+    store = SQLiteProgressStore(path, vocab_index=old)
+    store.append_events("u", [AnswerEvent(2, True, 1200, NOW)])
+    store.flush()
+
+    store = SQLiteProgressStore(path, vocab_index=VocabIndex(
+        {"A": [_word("alpha"), _word("beta"), _word("gamma")], "B": [_word("delta"), _word("omega")]}
+    ))
+    stats = store.load_word_stats("u", old.total_words)
+    assert stats.attempts[2] == 1 and stats.events == 1
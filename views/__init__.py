@@ -0,0 +1,30 @@
+"""Pages of the Streamlit app, one module per navigation mode.
+
+Each page module exposes ``render()`` and is imported the first time its
+page is shown, so a session that never opens a page never pays for its
+code or its dependencies.
+"""
+
+import importlib
+
+from views.common import span
+
+PAGES = {
+    "🏠 Dashboard": "views.dashboard",
+    "📖 Study Mode": "views.study",
+    "🧪 Test Yourself": "views.quiz",
+    "🎮 Games": "views.games",
+    "📊 Progress Report": "views.progress_report",
+    "⚙️ Settings": "views.settings",
+}
+
+# Pages reachable only by URL, as ?admin=<name>
+ADMIN_PAGES = {
+    "profile": "views.profile",
+}
+
+
+def render(app_mode):
+    module = PAGES.get(app_mode) or ADMIN_PAGES[app_mode]
+    with span(module):
+        importlib.import_module(module).render()
@@ -0,0 +1,96 @@
+"""Static page chrome: the app stylesheet and footer, built once per process.
+
+Every full rerun must emit them again, but as module constants they are not
+rebuilt, and identical messages above ``global.minCachedMessageSize`` (see
+``.streamlit/config.toml``) reach the browser as a short hash reference.
+"""
+
+from views.common import vocab_index
+
+APP_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        color: #1E3A8A;
+        text-align: center;
+        margin-bottom: 1rem;
+    }
+    .sub-header {
+        font-size: 1.5rem;
+        color: #374151;
+        margin-bottom: 1rem;
+    }
+    .flashcard {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 2rem;
+        border-radius: 15px;
+        color: white;
+        text-align: center;
+        box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+        min-height: 300px;
+        display: flex;
+        flex-direction: column;
+        justify-content: center;
+        align-items: center;
+        margin: 1rem 0;
+        transition: all 0.3s ease;
+    }
+    .flashcard:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 15px 35px rgba(0,0,0,0.3);
+    }
+    .word-display {
+        font-size: 3rem;
+        font-weight: bold;
+        margin-bottom: 1rem;
+    }
+    .simple-def {
+        font-size: 1.5rem;
+        font-style: italic;
+        margin-bottom: 1.5rem;
+        opacity: 0.9;
+    }
+    .meaning-display {
+        font-size: 1.8rem;
+        background: rgba(255,255,255,0.1);
+        padding: 1rem;
+        border-radius: 10px;
+        margin-top: 1rem;
+        width: 100%;
+    }
+    .score-badge {
+        background: #10B981;
+        color: white;
+        padding: 0.5rem 1rem;
+        border-radius: 20px;
+        font-weight: bold;
+        display: inline-block;
+    }
+    .progress-bar {
+        height: 10px;
+        border-radius: 5px;
+        margin: 1rem 0;
+    }
+    .progress-table {
+        max-height: 400px;
+        overflow-y: auto;
+    }
+    .progress-table table {
+        width: 100%;
+    }
+    .test-question {
+        background: #F3F4F6;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin: 1rem 0;
+        border-left: 5px solid #3B82F6;
+    }
+</style>
+"""
+
+FOOTER_HTML = (
+    "<div style='text-align: center; color: #6B7280;'>"
+    "📚 GRE Vocabulary Master • Study Smarter, Not Harder • "
+    f"<span id='word-count'>{vocab_index.total_words}</span> words to master"
+    "</div>"
+)
@@ -0,0 +1,210 @@
+"""Resources and session helpers shared by the app shell and the pages."""
+
+import functools
+import hmac
+import os
+from datetime import datetime
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from core.index import VocabIndex
+from core.distractors import DistractorPool
+from core.profiler import ENABLED as PROFILE_ENABLED, NULL_SPAN, profiler
+from core.session_model import TestRecord
+from core.storage import SQLiteProgressStore
+
+# Load vocab data from the compiled store (rebuilt from data/vocab_data.py when stale)
+try:
+    from core.store import load_vocab_groups
+    vocab_groups = load_vocab_groups()
+except ImportError:
+    # Fallback minimal vocabulary for testing
+    vocab_groups = {
+        "Group 1": [
+            {"word": "abound", "simple": "be plentiful", "meaning": "প্রচুর থাকা"},
+            {"word": "austere", "simple": "strict, plain, simple", "meaning": "কঠোর, সাধারণ, সরল"},
+            {"word": "capricious", "simple": "impulsive, unpredictable", "meaning": "আবেগপ্রবণ, অনিয়মিত"},
+        ]
+    }
+
+# Shared resources, built once per process. Modules that need NumPy are
+# imported by the getters that use them, so pages without search or tests
+# never load them.
+@st.cache_resource(show_spinner=False)
+def get_vocab_index():
+    return VocabIndex(vocab_groups)
+
+@st.cache_resource(show_spinner=False)
+def get_search_index():
+    from core.search import load_search_index
+    return load_search_index(get_vocab_index())
+
+@st.cache_resource(show_spinner=False)
+def get_fuzzy_matcher():
+    from core.fuzzy import load_fuzzy
+    return load_fuzzy(get_vocab_index())
+
+@st.cache_resource(show_spinner=False)
+def get_distractor_pool():
+    return DistractorPool(get_vocab_index())
+
+@st.cache_resource(show_spinner="Preparing test questions...")
+def get_similarity():
+    from core.similarity import load_similarity
+    return load_similarity(get_vocab_index())
+
+@st.cache_resource(show_spinner="Preparing test questions...")
+def get_question_bank(difficulty):
+    from core.bank import load_bank
+    from core.questions import SIMILAR_DIFFICULTIES
+    similarity = get_similarity() if difficulty in SIMILAR_DIFFICULTIES else None
+    return load_bank(get_vocab_index(), get_distractor_pool(), difficulty, similarity)
+
+@st.cache_resource(show_spinner=False)
+def get_progress_store():
+    return SQLiteProgressStore(vocab_index=get_vocab_index())
+
+vocab_index = get_vocab_index()
+progress_store = get_progress_store()
+
+# Pages and switches that affect the whole process need GRE_ADMIN_TOKEN,
+# passed as ?token=; without it set they are off
+ADMIN_TOKEN = os.environ.get("GRE_ADMIN_TOKEN", "")
+
+def is_admin():
+    """Whether this session opened the app with the admin token."""
+    if 'is_admin' not in st.session_state:
+        token = st.query_params.get("token", "")
+        st.session_state.is_admin = bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+    return st.session_state.is_admin
+
+def profiling():
+    """Whether this session's sections are timed (GRE_PROFILE, or ?profile=1 with the admin token)."""
+    return PROFILE_ENABLED or st.session_state.get('profiling', False)
+
+def span(name):
+    """Time a section when profiling; otherwise a shared no-op context manager."""
+    return profiler.span(name) if profiling() else NULL_SPAN
+
+def timed(name):
+    """Decorator form of :func:`span`, for fragments that rerun on their own."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def render_suggestions(query, exclude=()):
+    """Show close spellings of ``query`` from every group."""
+    suggestions = [(word_id, dist) for word_id, dist in get_fuzzy_matcher().lookup(query, k=5) if word_id not in exclude]
+    if suggestions:
+        st.write("**Did you mean:**")
+        for word_id, _ in suggestions:
+            word_data = vocab_index.records[word_id]
+            group = vocab_index.group_names[vocab_index.word_group_ids[word_id]]
+            st.markdown(f"• **{word_data['word']}** · {group} — {word_data['simple']}")
+
+def get_test_results():
+    """Test history, loaded from the progress store on first use."""
+    if 'test_results' not in st.session_state:
+        st.session_state.test_results = progress_store.load_test_results(st.session_state.user_id, vocab_index)
+    return st.session_state.test_results
+
+def save_group_progress(group):
+    g = vocab_index.group_position[group]
+    progress_store.save_group_progress(st.session_state.user_id, group, st.session_state.progress.group_dict(g))
+
+def get_word_stats():
+    """Per-word answer aggregates, loaded from the progress store on first use."""
+    if 'word_stats' not in st.session_state:
+        st.session_state.word_stats = progress_store.load_word_stats(st.session_state.user_id, vocab_index.total_words)
+    return st.session_state.word_stats
+
+def get_word_sampler():
+    """The user's error-weighted test word sampler, built from their word stats on first use."""
+    if 'word_sampler' not in st.session_state:
+        from core.sampling import WordSampler
+        st.session_state.word_sampler = WordSampler(vocab_index, get_word_stats())
+    return st.session_state.word_sampler
+
+def get_response_times():
+    """The user's response-time quantiles, recomputed only after new answers."""
+    stats = get_word_stats()
+    events, response_times = st.session_state.get('response_times', (None, None))
+    if events != stats.events:
+        from core.response_times import ResponseTimes
+        word_ids, latency_ms = progress_store.load_latencies(st.session_state.user_id)
+        response_times = ResponseTimes(word_ids, latency_ms, vocab_index)
+        st.session_state.response_times = (stats.events, response_times)
+    return response_times
+
+def log_answer_events(events):
+    progress_store.append_events(st.session_state.user_id, events)
+    if 'word_stats' in st.session_state:
+        st.session_state.word_stats.apply_many(events)
+        if 'word_sampler' in st.session_state:
+            st.session_state.word_sampler.update(st.session_state.word_stats, [e.word_id for e in events])
+
+def checkpoint_test():
+    """Save the in-progress test under its resume token (the ?test= query parameter)."""
+    token = st.session_state.get('test_token')
+    if token:
+        progress_store.save_checkpoint(token, st.session_state.user_id, {
+            "started_at": st.session_state.test_start_time.timestamp(),
+            "one_page": bool(st.session_state.get('test_one_page')),
+            "options": st.session_state.test_batch.options[0].tobytes(),
+            "record": st.session_state.test_record.to_bytes(),
+        })
+
+def resume_test(token):
+    """Restore the user's test checkpointed under ``token``; return True if there was one."""
+    checkpoint = progress_store.load_checkpoint(token)
+    if checkpoint is None or checkpoint["user_id"] != st.session_state.user_id:
+        return False
+    from core.questions import batch_from_record
+    record = TestRecord.from_bytes(checkpoint["record"], vocab_index)
+    st.session_state.test_batch = batch_from_record(record.word_ids, record.qtypes, record.shown, checkpoint["options"])
+    st.session_state.test_record = record
+    st.session_state.current_question = len(record.answers)
+    st.session_state.test_in_progress = True
+    st.session_state.test_saved = False
+    st.session_state.test_one_page = checkpoint["one_page"]
+    st.session_state.test_start_time = datetime.fromtimestamp(checkpoint["started_at"])
+    # Another process's monotonic clock means nothing here; time it by the wall clock
+    st.session_state.test_started_ns = None
+    # The question it stopped at was shown before the resume, so its answer goes unmeasured (latency 0)
+    st.session_state.question_started = (st.session_state.current_question, None)
+    st.session_state.test_token = token
+    return True
+
+def end_test_checkpoint():
+    """Drop the finished test's checkpoint and its resume token."""
+    token = st.session_state.get('test_token')
+    if token:
+        progress_store.delete_checkpoint(token)
+        st.session_state.test_token = None
+        if st.query_params.get("test") == token:
+            del st.query_params["test"]
+
+def get_progress_view(build):
+    """A table built from the progress arrays, rebuilt only when the progress version changes."""
+    progress = st.session_state.progress
+    version, views = st.session_state.get('progress_views', (None, None))
+    if version != progress.version:
+        views = {}
+        st.session_state.progress_views = (progress.version, views)
+    if build.__name__ not in views:
+        views[build.__name__] = build(progress)
+    return views[build.__name__]
+
+# Pages put their interactive sections in fragments, which rerun on their own
+# when their widgets are used without re-executing the sidebar and the rest
+# of the page.
+def rerun_fragment():
+    """Rerun just the current fragment, or the whole page if this is a full run."""
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run:
+        st.rerun(scope="fragment")
+    st.rerun()
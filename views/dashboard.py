@@ -0,0 +1,84 @@
+"""Dashboard: headline numbers, recent tests and the progress overview."""
+
+import html
+
+import streamlit as st
+from views.common import get_progress_view, get_test_results, vocab_index
+
+
+def progress_table(progress):
+    """Progress overview as a plain HTML table, so the landing page never loads pandas."""
+    rows = "".join(
+        f"<tr><td>{html.escape(group)}</td><td>{'Yes' if progress.studied[g] else 'No'}</td>"
+        f"<td>{progress.best_score[g]:.1f}</td><td>{progress.cards_viewed[g]}</td></tr>"
+        for g, group in enumerate(progress.group_names)
+    )
+    return (
+        "<div class='progress-table'><table>"
+        "<thead><tr><th>Group</th><th>Studied</th><th>Best Score</th><th>Cards Viewed</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table></div>"
+    )
+
+
+def render():
+    st.markdown("<h1 class='main-header'>Welcome to GRE Vocabulary Master! 🎓</h1>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align: center; font-size: 1.2rem;'>Master 1000+ GRE words with interactive learning</p>", unsafe_allow_html=True)
+    
+    # Dashboard metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Words", vocab_index.total_words)
+    
+    with col2:
+        st.metric("Groups", vocab_index.n_groups)
+    
+    with col3:
+        tests_taken = st.session_state.progress.tests_taken
+        st.metric("Tests Taken", tests_taken)
+    
+    with col4:
+        if st.session_state.total_questions > 0:
+            st.metric("Total Practice", st.session_state.total_questions)
+        else:
+            st.metric("Total Practice", "0")
+    
+    st.markdown("---")
+    
+    # Quick actions
+    st.subheader("Quick Actions")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if st.button("🚀 Start Studying", use_container_width=True, help="Jump into study mode"):
+            st.session_state.app_mode = "📖 Study Mode"
+            st.rerun()
+    
+    with col2:
+        if st.button("🧪 Take a Test", use_container_width=True, help="Test your knowledge"):
+            st.session_state.app_mode = "🧪 Test Yourself"
+            st.rerun()
+    
+    with col3:
+        if st.button("🎮 Play a Game", use_container_width=True, help="Learn through games"):
+            st.session_state.app_mode = "🎮 Games"
+            st.rerun()
+    
+    # Recent activity
+    st.subheader("Recent Activity")
+    test_results = get_test_results()
+    if test_results:
+        latest_results = test_results[-3:]  # Last 3 tests
+        for record in reversed(latest_results):
+            result = record.summary()
+            with st.expander(f"{result['date']} - {result['group']} - Score: {result['score']}"):
+                st.write(f"**Type:** {result.get('type', 'Multiple Choice')}")
+                st.write(f"**Score:** {result['score']}")
+                st.write(f"**Time:** {result.get('time_taken', 'N/A')}")
+    else:
+        st.info("No test results yet. Take your first test to see activity here!")
+    
+    # Progress chart
+    st.subheader("Learning Progress")
+    st.markdown(get_progress_view(progress_table), unsafe_allow_html=True)
@@ -0,0 +1,35 @@
+"""Browser-side flashcard deck.
+
+A custom component (plain HTML and JavaScript in ``deck_frontend/``) that
+receives a whole group's cards once and flips and pages through them
+without a server round trip, with keyboard shortcuts. What happened is
+sent back in batches as the component value; each batch reruns only the
+enclosing fragment.
+"""
+
+import os
+
+import streamlit.components.v1 as components
+
+_flashcard_deck = components.declare_component(
+    "flashcard_deck", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "deck_frontend")
+)
+
+# The browser sends a batch after this many card views/flips, or once the
+# deck has been idle this long
+BATCH_EVENTS = 10
+BATCH_IDLE_MS = 4000
+
+
+def client_deck(group, cards, start=0, key=None):
+    """Show ``cards`` (``(word, simple, meaning)`` rows) starting at ``start``.
+
+    Returns the latest batch, ``{mount, seq, group, index, showing,
+    reached}``, or None before the first one. The same batch is returned
+    on every rerun until the browser sends the next.
+    """
+    return _flashcard_deck(
+        group=group, cards=cards, start=start,
+        batch_events=BATCH_EVENTS, batch_idle_ms=BATCH_IDLE_MS,
+        key=key, default=None
+    )
@@ -0,0 +1,93 @@
+"""Learning games for the current group."""
+
+import random
+
+import streamlit as st
+from views.common import timed, vocab_index
+
+
+@st.fragment
+@timed("games.word_match")
+def word_match_game():
+    """Word Match; picking matches and checking them reruns only this fragment."""
+    current_group = vocab_index.group_records[st.session_state.current_group]
+    
+    st.subheader("🔤 Word Match Game")
+    st.write("Match words with their correct definitions!")
+
+    if st.button("🎯 Start Matching Game", use_container_width=True):
+        game_words = random.sample(current_group, min(8, len(current_group)))
+
+        # Prepare game state
+        st.session_state.game_words = [w['word'] for w in game_words]
+        st.session_state.game_defs = [w['simple'] for w in game_words]
+        random.shuffle(st.session_state.game_defs)
+
+        st.session_state.game_correct = {w['word']: w['simple'] for w in game_words}
+        st.session_state.game_matches = {}
+        st.session_state.game_started = True
+
+    if 'game_started' in st.session_state and st.session_state.game_started:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.write("### Words")
+            for word in st.session_state.game_words:
+                st.write(f"• **{word}**")
+
+        with col2:
+            st.write("### Definitions")
+            for i, definition in enumerate(st.session_state.game_defs):
+                st.write(f"{i+1}. {definition}")
+
+        # Matching interface
+        st.write("### Make Your Matches")
+        for word in st.session_state.game_words:
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                st.write(f"**{word}**")
+            with col2:
+                selected_def = st.selectbox(
+                    f"Match for {word}:",
+                    [""] + st.session_state.game_defs,
+                    key=f"match_{word}"
+                )
+                if selected_def:
+                    st.session_state.game_matches[word] = selected_def
+
+        if st.button("✅ Check Matches", use_container_width=True):
+            correct = 0
+            total = len(st.session_state.game_words)
+
+            for word in st.session_state.game_words:
+                if word in st.session_state.game_matches:
+                    if st.session_state.game_matches[word] == st.session_state.game_correct[word]:
+                        correct += 1
+
+            st.success(f"Score: {correct}/{total}")
+
+            if correct == total:
+                st.balloons()
+                st.balloons()
+                st.success("🎉 Perfect! All matches correct!")
+
+            # Show answers
+            with st.expander("Show Answers"):
+                for word, correct_def in st.session_state.game_correct.items():
+                    user_match = st.session_state.game_matches.get(word, "No match")
+                    if user_match == correct_def:
+                        st.write(f"✅ **{word}** → {correct_def}")
+                    else:
+                        st.write(f"❌ **{word}** → Your: '{user_match}' | Correct: '{correct_def}'")
+
+
+def render():
+    st.markdown("<h1 class='main-header'>🎮 Learning Games</h1>", unsafe_allow_html=True)
+    
+    game_choice = st.selectbox(
+        "Choose a game:",
+        ["Word Match", "Memory Game", "Word Scramble", "Speed Challenge"]
+    )
+    
+    if game_choice == "Word Match":
+        word_match_game()
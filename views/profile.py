@@ -0,0 +1,47 @@
+"""Hidden profiler page (?admin=profile): per-section rerun timings."""
+
+import os
+
+import streamlit as st
+from core.profiler import PROFILE_PATH, profiler
+from views.common import profiling
+
+
+def render():
+    st.markdown("<h1 class='main-header'>🛠️ Rerun Profile</h1>", unsafe_allow_html=True)
+    
+    if not profiling():
+        st.info("Profiling is off. Set GRE_PROFILE=1, or add ?profile=1 to this admin URL, to collect timings.")
+    
+    summary = profiler.summary()
+    if summary:
+        st.dataframe(
+            [
+                {
+                    "Section": name,
+                    "Runs": stats["count"],
+                    "p50 (ms)": round(stats["p50_ms"], 2),
+                    "p95 (ms)": round(stats["p95_ms"], 2),
+                    "Max (ms)": round(stats["max_ms"], 2),
+                    "Mean alloc (KB)": round(stats["alloc_bytes_mean"] / 1024, 1)
+                }
+                for name, stats in summary.items()
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        st.caption("Sections nest: page timings include the fragments and generation spans inside them.")
+    else:
+        st.info("No timings recorded yet in this process.")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("💾 Write JSON", use_container_width=True):
+            st.success(f"Wrote {profiler.dump(os.path.splitext(PROFILE_PATH)[0] + '.json')}")
+    with col2:
+        if st.button("📈 Write Prometheus", use_container_width=True):
+            st.success(f"Wrote {profiler.dump(os.path.splitext(PROFILE_PATH)[0] + '.prom')}")
+    with col3:
+        if st.button("🧹 Reset", use_container_width=True):
+            profiler.reset()
+            st.rerun()
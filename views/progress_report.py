@@ -0,0 +1,166 @@
+"""Progress Report: group-by-group progress, missed words, response times and test history."""
+
+import heapq
+
+import pandas as pd
+import streamlit as st
+from core.response_times import QUANTILES
+from views.common import get_progress_view, get_response_times, get_test_results, get_word_stats, vocab_index
+
+# Histogram bins for answer times; the last one is open-ended
+RESPONSE_TIME_BINS_MS = (0, 2000, 4000, 6000, 10000, 20000, 30000)
+RESPONSE_TIME_LABELS = ("<2 s", "2-4 s", "4-6 s", "6-10 s", "10-20 s", "20-30 s", "30 s+")
+
+
+def report_frame(progress):
+    return pd.DataFrame({
+        "Group": list(progress.group_names),
+        "Status": ["✅ Completed" if studied else "📖 In Progress" for studied in progress.studied],
+        "Best Score": [f"{score}%" if score > 0 else "Not Taken" for score in progress.best_score],
+        "Cards Viewed": progress.cards_viewed.tolist(),
+        "Last Attempt": [progress.last_attempt_str(g) or "Never" for g in range(len(progress.group_names))]
+    })
+
+
+def response_time_frame(response_times):
+    """Answer-time quartiles and 90th percentile per group, for groups with timed answers."""
+    answered = response_times.group_counts > 0
+    p25, median, p90 = (response_times.groups[:, answered] / 1000).round(1)  # QUANTILES order
+    return pd.DataFrame({
+        "Group": [name for name, has in zip(vocab_index.group_names, answered) if has],
+        "Timed Answers": response_times.group_counts[answered],
+        "P25 (s)": p25,
+        "Median (s)": median,
+        "P90 (s)": p90,
+    })
+
+
+def render():
+    st.markdown("<h1 class='main-header'>📊 Your Learning Progress</h1>", unsafe_allow_html=True)
+    
+    # Overall statistics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        progress = st.session_state.progress
+        studied_groups = progress.studied_count
+        st.metric("Groups Completed", f"{studied_groups}/{vocab_index.n_groups}")
+    
+    with col2:
+        tests_taken = progress.tests_taken
+        st.metric("Tests Taken", tests_taken)
+    
+    with col3:
+        total_cards = progress.total_cards
+        st.metric("Cards Viewed", total_cards)
+    
+    with col4:
+        if st.session_state.total_questions > 0:
+            overall_accuracy = (st.session_state.score / st.session_state.total_questions) * 100
+            st.metric("Overall Accuracy", f"{overall_accuracy:.1f}%")
+        else:
+            st.metric("Overall Accuracy", "0%")
+    
+    st.markdown("---")
+    
+    # Group-wise progress
+    st.subheader("📈 Group-wise Progress")
+    
+    df = get_progress_view(report_frame)
+    if not df.empty:
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        
+        # Visual progress
+        st.subheader("📊 Progress Visualization")
+        
+        # Completion chart
+        completion_data = {
+            "Completed": studied_groups,
+            "Remaining": vocab_index.n_groups - studied_groups
+        }
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.bar_chart(completion_data)
+        
+        with col2:
+            # Test scores
+            if progress.tests_taken:
+                st.metric("Average Test Score", f"{progress.average_best_score:.1f}%")
+    
+    # Words answered wrong most often
+    st.subheader("🎯 Most Missed Words")
+    word_stats = get_word_stats()
+    missed = heapq.nlargest(
+        10,
+        (word_id for word_id in range(word_stats.n_words) if word_stats.attempts[word_id] > word_stats.correct[word_id]),
+        key=lambda word_id: (word_stats.attempts[word_id] - word_stats.correct[word_id], word_stats.error_rate(word_id))
+    )
+    if missed:
+        for word_id in missed:
+            word_data = vocab_index.records[word_id]
+            attempts = word_stats.attempts[word_id]
+            wrong = attempts - word_stats.correct[word_id]
+            st.write(f"**{word_data['word']}** — {word_data['simple']} · missed {wrong} of {attempts}")
+    else:
+        st.info("No missed words yet. Answers from tests and reviews show up here.")
+
+    # How long recall takes, per group and for the slowest words
+    st.subheader("⏱️ Response Times")
+    response_times = get_response_times()
+    if response_times.n_answers:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Timed Answers", response_times.n_answers)
+        with col2:
+            st.metric("Median", f"{response_times.quantile(0.5) / 1000:.1f} s")
+        with col3:
+            st.metric("90th Percentile", f"{response_times.quantile(0.9) / 1000:.1f} s")
+
+        counts = response_times.histogram(RESPONSE_TIME_BINS_MS)
+        st.bar_chart(pd.DataFrame(
+            {"Answers": counts},
+            index=pd.CategoricalIndex(RESPONSE_TIME_LABELS, categories=RESPONSE_TIME_LABELS, ordered=True)
+        ))
+
+        st.dataframe(response_time_frame(response_times), use_container_width=True, hide_index=True)
+
+        st.write("**Slowest to recall** (median over at least 2 answers):")
+        slowest = response_times.slowest_words()
+        if slowest:
+            for word_id in slowest:
+                word_data = vocab_index.records[word_id]
+                median = response_times.words[QUANTILES.index(0.5), word_id]
+                st.write(
+                    f"**{word_data['word']}** — {word_data['simple']} · "
+                    f"{median / 1000:.1f} s over {response_times.word_counts[word_id]} answers"
+                )
+        else:
+            st.caption("Answer words more than once to see which take longest.")
+    else:
+        st.info("No timed answers yet. Questions answered one at a time and reviews are timed.")
+
+    # Test history
+    st.subheader("📋 Test History")
+    test_results = get_test_results()
+    if test_results:
+        for record in reversed(test_results[-10:]):  # Last 10 tests
+            result = record.summary()
+            with st.expander(f"{result['date']} - {result['group']} - Score: {result['score']} ({result['percentage']:.1f}%)"):
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"**Test Type:** {result.get('type', 'N/A')}")
+                    st.write(f"**Time Taken:** {result.get('time_taken', 'N/A')}")
+                with col2:
+                    st.write(f"**Score:** {result['score']}")
+                    st.write(f"**Percentage:** {result['percentage']:.1f}%")
+                
+                # Performance indicator
+                if result['percentage'] >= 80:
+                    st.success("Excellent Performance")
+                elif result['percentage'] >= 60:
+                    st.warning("Good Performance")
+                else:
+                    st.info("Needs Improvement")
+    else:
+        st.info("No test history available yet. Take some tests to see your progress here!")
@@ -0,0 +1,376 @@
+"""Test Yourself: generate a test for the current group, several groups or the whole deck, ask it and score it."""
+
+import time
+import uuid
+from datetime import datetime
+
+import numpy as np
+import streamlit as st
+from core.bank import assemble_test
+from core.events import AnswerEvent
+from core.questions import TEST_TYPES, grade_test, question_dict
+from core.session_model import ANSWER_SKIPPED, ANSWER_TYPED, TestRecord
+from views.common import (
+    checkpoint_test, end_test_checkpoint, get_question_bank, get_test_results, get_word_sampler,
+    log_answer_events, progress_store, rerun_fragment, save_group_progress, span, timed, vocab_index
+)
+
+
+TEST_SCOPES = ("This group", "Several groups", "Whole deck")
+MAX_GROUP_QUESTIONS = 30
+MAX_MIXED_QUESTIONS = 200
+
+
+def test_label(group_names):
+    """The name a test is filed under: its group, or a summary of the groups it spans."""
+    if len(group_names) == 1:
+        return group_names[0]
+    if len(group_names) == vocab_index.n_groups:
+        return "Whole deck"
+    if len(group_names) <= 3:
+        return " + ".join(group_names)
+    return f"{len(group_names)} groups"
+
+
+def test_elapsed_ms():
+    """Milliseconds since the test started, by the monotonic clock unless it was resumed from a checkpoint."""
+    started = st.session_state.get('test_started_ns')
+    if started is not None:
+        return (time.perf_counter_ns() - started) // 1_000_000
+    return int((datetime.now() - st.session_state.test_start_time).total_seconds() * 1000)
+
+
+def record_answer(answer, is_correct, typed=None):
+    """Store the answer code for the current test question and move on to the next one."""
+    started = st.session_state.get('question_started')
+    latency_ms = 0
+    if started and started[0] == st.session_state.current_question and started[1] is not None:
+        latency_ms = (time.perf_counter_ns() - started[1]) // 1_000_000
+    st.session_state.test_record.add_answer(answer, is_correct, latency_ms, typed)
+    st.session_state.current_question += 1
+    # Fragment reruns skip the app's end-of-run flush, so make the checkpoint durable here
+    checkpoint_test()
+    progress_store.flush()
+    # Next question reruns just the question fragment; the results page needs the whole page
+    if st.session_state.current_question < st.session_state.test_batch.n_questions:
+        rerun_fragment()
+    st.rerun()
+
+
+@st.fragment
+@timed("quiz.question")
+def test_question():
+    """The current test question; answering reruns only this fragment until the last one."""
+    batch = st.session_state.test_batch
+    n_questions = batch.n_questions
+    current_q = st.session_state.current_question
+    
+    question = question_dict(batch, 0, current_q, vocab_index)
+
+    # Start the clock the first time this question is shown (a resumed
+    # question keeps its unmeasured marker)
+    started = st.session_state.get('question_started')
+    if not started or started[0] != current_q:
+        st.session_state.question_started = (current_q, time.perf_counter_ns())
+
+    st.markdown(f"### Question {current_q + 1} of {n_questions}")
+
+    # Progress bar
+    progress = (current_q + 1) / n_questions
+    st.progress(progress)
+
+    # Display question based on type
+    if question["type"] == "multiple_choice":
+        st.markdown(f"#### {question['question']}")
+        st.caption(f"Hint: {question['simple_def']}")
+
+        selected = st.radio(
+            "Select your answer:",
+            question["options"],
+            key=f"q_{current_q}"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✅ Submit Answer", use_container_width=True, type="primary"):
+                answer = int(batch.options[0, current_q][question["options"].index(selected)])
+                record_answer(answer, selected == question["correct_answer"])
+
+        with col2:
+            if st.button("⏭️ Skip Question", use_container_width=True):
+                record_answer(ANSWER_SKIPPED, False)
+
+    elif question["type"] == "fill_blank":
+        st.markdown(f"#### {question['question']}")
+        st.caption(f"Hint: {question['hint']}")
+
+        user_answer = st.text_input("Your answer:", key=f"q_{current_q}")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✅ Submit Answer", use_container_width=True, type="primary"):
+                # Simple check - could be improved
+                is_correct = question["correct_answer"].lower() in user_answer.lower()
+                record_answer(None, is_correct, typed=user_answer)
+
+        with col2:
+            if st.button("⏭️ Skip Question", use_container_width=True):
+                record_answer(ANSWER_SKIPPED, False)
+
+    elif question["type"] == "true_false":
+        st.markdown(f"#### {question['statement']}")
+
+        selected = st.radio(
+            "Is this statement true or false?",
+            ["True", "False"],
+            key=f"q_{current_q}"
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("✅ Submit Answer", use_container_width=True, type="primary"):
+                record_answer(1 if selected == "True" else 0, selected == question["correct_answer"])
+
+        with col2:
+            if st.button("⏭️ Skip Question", use_container_width=True):
+                record_answer(ANSWER_SKIPPED, False)
+
+
+def test_form():
+    """Every question of the test in one form: a single rerun submits and grades them all."""
+    batch = st.session_state.test_batch
+    n_questions = batch.n_questions
+    questions = [question_dict(batch, 0, q, vocab_index) for q in range(n_questions)]
+    
+    with st.form("whole_test"):
+        choices = []
+        for q, question in enumerate(questions):
+            st.markdown(f"### Question {q + 1} of {n_questions}")
+            if question["type"] == "multiple_choice":
+                st.markdown(f"#### {question['question']}")
+                st.caption(f"Hint: {question['simple_def']}")
+                choices.append(st.radio("Select your answer:", question["options"], index=None, key=f"form_q_{q}"))
+            elif question["type"] == "fill_blank":
+                st.markdown(f"#### {question['question']}")
+                st.caption(f"Hint: {question['hint']}")
+                choices.append(st.text_input("Your answer:", key=f"form_q_{q}"))
+            else:
+                st.markdown(f"#### {question['statement']}")
+                choices.append(st.radio(
+                    "Is this statement true or false?", ["True", "False"], index=None, key=f"form_q_{q}"
+                ))
+        submitted = st.form_submit_button("✅ Submit Test", use_container_width=True, type="primary")
+    
+    if submitted:
+        # Unanswered questions count as skipped
+        answers = [ANSWER_SKIPPED] * n_questions
+        typed = {}
+        for q, (question, choice) in enumerate(zip(questions, choices)):
+            if not choice:
+                continue
+            if question["type"] == "multiple_choice":
+                answers[q] = int(batch.options[0, q][question["options"].index(choice)])
+            elif question["type"] == "fill_blank":
+                answers[q] = ANSWER_TYPED
+                typed[q] = choice
+            else:
+                answers[q] = 1 if choice == "True" else 0
+        correct = grade_test(batch, 0, answers, typed, vocab_index)
+        # Time per question isn't observable in a form; 0 leaves it out of the response times
+        st.session_state.test_record.add_answers(answers, correct, [0] * n_questions, typed)
+        st.session_state.current_question = n_questions
+        st.rerun()
+
+
+def render():
+    st.markdown("<h1 class='main-header'>🧪 Test Yourself</h1>", unsafe_allow_html=True)
+    
+    # Which groups the test draws its words from
+    scope = st.radio("Draw words from:", TEST_SCOPES, horizontal=True, key="test_scope")
+    if scope == "Several groups":
+        group_names = st.multiselect(
+            "Groups:", vocab_index.group_names, default=[st.session_state.current_group], key="test_groups"
+        ) or [st.session_state.current_group]
+    elif scope == "Whole deck":
+        group_names = list(vocab_index.group_names)
+    else:
+        group_names = [st.session_state.current_group]
+    n_words = sum(vocab_index.group_sizes[name] for name in group_names)
+    max_questions = MAX_GROUP_QUESTIONS if len(group_names) == 1 else MAX_MIXED_QUESTIONS
+    
+    # Test configuration
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        test_type = st.selectbox(
+            "Test Type:",
+            TEST_TYPES
+        )
+    
+    with col2:
+        num_questions = st.slider(
+            "Number of Questions:",
+            min_value=5,
+            max_value=min(max_questions, n_words),
+            value=min(10, n_words),
+            step=5
+        )
+    
+    with col3:
+        difficulty = st.selectbox(
+            "Difficulty:",
+            ["Easy", "Medium", "Hard", "Expert"]
+        )
+    
+    one_page = st.toggle(
+        "📝 Whole test on one page", key="one_page_test",
+        help="Answer every question, then submit them all at once"
+    )
+    
+    # Initialize test session
+    if 'test_in_progress' not in st.session_state:
+        st.session_state.test_in_progress = False
+    
+    if 'test_batch' not in st.session_state:
+        st.session_state.test_batch = None
+    
+    if 'current_question' not in st.session_state:
+        st.session_state.current_question = 0
+    
+    if 'test_record' not in st.session_state:
+        st.session_state.test_record = None
+    
+    if 'test_saved' not in st.session_state:
+        st.session_state.test_saved = False
+    
+    # Start test button
+    if not st.session_state.test_in_progress:
+        if st.button("🚀 Start Test", type="primary", use_container_width=True):
+            # Prepare test questions
+            # Words the user tends to miss come up more often
+            with span("quiz.assemble_test"):
+                groups = [vocab_index.group_position[name] for name in group_names]
+                word_ids = get_word_sampler().draw(np.random.default_rng(), groups, num_questions)
+                batch = assemble_test(get_question_bank(difficulty), word_ids, test_type)
+            
+            st.session_state.test_batch = batch
+            st.session_state.test_record = TestRecord.from_batch(batch, 0, test_label(group_names), test_type)
+            st.session_state.test_in_progress = True
+            st.session_state.current_question = 0
+            st.session_state.test_saved = False
+            st.session_state.test_one_page = one_page
+            st.session_state.test_start_time = datetime.now()
+            st.session_state.test_started_ns = time.perf_counter_ns()
+            
+            # ?test=<token> resumes this test after a reconnect or a server restart
+            st.session_state.test_token = uuid.uuid4().hex
+            st.query_params["test"] = st.session_state.test_token
+            checkpoint_test()
+            st.rerun()
+    
+    # Display test questions
+    if st.session_state.test_in_progress and st.session_state.test_batch is not None:
+        if st.session_state.current_question < st.session_state.test_batch.n_questions:
+            if st.session_state.get('test_one_page'):
+                test_form()
+            else:
+                test_question()
+        else:
+            # Test completed
+            # Calculate score
+            record = st.session_state.test_record
+            correct = record.n_correct
+            total = record.n_total
+            score_percent = record.percentage
+            
+            # Record the result once, not on every rerun of the results page
+            if not st.session_state.test_saved:
+                record.time_taken_ms = test_elapsed_ms()
+                record.taken_at = time.time()
+                
+                # Update session state
+                st.session_state.score += correct
+                st.session_state.total_questions += total
+                
+                # Update progress for this group (tests across groups only count per word)
+                in_group = record.group in vocab_index.group_position
+                if in_group:
+                    st.session_state.progress.record_test(vocab_index.group_position[record.group], score_percent)
+                
+                # Save test result
+                get_test_results().append(record)
+                st.session_state.test_saved = True
+                end_test_checkpoint()
+                
+                user_id = st.session_state.user_id
+                if in_group:
+                    save_group_progress(record.group)
+                progress_store.save_totals(user_id, st.session_state.score, st.session_state.total_questions)
+                progress_store.record_test(user_id, record)
+                log_answer_events([
+                    AnswerEvent(record.word_ids[q], record.correct[q], record.latency_ms[q], record.taken_at)
+                    for q in range(record.n_total)
+                ])
+                progress_store.flush()
+                st.balloons()
+            
+            time_taken = record.time_taken_ms / 1000
+            
+            # Display results
+            st.markdown("<h2 style='text-align: center; color: #10B981;'>🎉 Test Completed! 🎉</h2>", unsafe_allow_html=True)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Your Score", f"{correct}/{total}")
+            with col2:
+                st.metric("Percentage", f"{score_percent:.1f}%")
+            with col3:
+                st.metric("Time Taken", f"{time_taken:.1f} sec")
+            
+            # Performance feedback
+            if score_percent >= 90:
+                st.success("🌟 Outstanding! You've mastered this group!")
+            elif score_percent >= 75:
+                st.success("👍 Excellent work! Keep it up!")
+            elif score_percent >= 60:
+                st.warning("📚 Good effort! Review the missed words.")
+            else:
+                st.info("📖 Needs improvement. Study this group again.")
+            
+            # Detailed results
+            with st.expander("📋 View Detailed Results", expanded=True):
+                for i, ans in enumerate(record.details(vocab_index), 1):
+                    col1, col2 = st.columns([1, 4])
+                    with col1:
+                        if ans["is_correct"]:
+                            st.success(f"Q{i}")
+                        else:
+                            st.error(f"Q{i}")
+                    with col2:
+                        st.write(f"**Question:** {ans['question']}")
+                        st.write(f"**Your answer:** {ans['user_answer']}")
+                        st.write(f"**Correct answer:** {ans['correct_answer']}")
+                        st.write("---")
+            
+            # Actions after test
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                if st.button("📊 Review Group", use_container_width=True):
+                    st.session_state.app_mode = "📖 Study Mode"
+                    st.rerun()
+            with col2:
+                if st.button("🧪 Take Another Test", use_container_width=True, type="primary"):
+                    st.session_state.test_in_progress = False
+                    st.session_state.test_batch = None
+                    st.session_state.test_record = None
+                    st.session_state.current_question = 0
+                    st.rerun()
+            with col3:
+                if st.button("🏠 Back to Dashboard", use_container_width=True):
+                    st.session_state.test_in_progress = False
+                    st.session_state.test_batch = None
+                    st.session_state.test_record = None
+                    st.rerun()
+    
+    elif not st.session_state.test_in_progress:
+        st.info("Configure your test settings above and click 'Start Test' to begin.")
@@ -0,0 +1,145 @@
+"""Settings: display and study preferences, progress export and import."""
+
+import json
+from datetime import datetime
+
+import streamlit as st
+from core.scheduler import ReviewScheduler
+from core.session_model import TestRecord
+from views.common import get_test_results, progress_store, save_group_progress, vocab_index
+
+
+def render():
+    st.markdown("<h1 class='main-header'>⚙️ Settings</h1>", unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Appearance")
+        
+        # Dark mode toggle
+        dark_mode = st.toggle("Dark Mode", value=st.session_state.dark_mode)
+        if dark_mode != st.session_state.dark_mode:
+            st.session_state.dark_mode = dark_mode
+            st.info("Dark mode setting changed. Refresh to see effect.")
+        
+        # Font size
+        font_size = st.select_slider(
+            "Font Size",
+            options=["Small", "Medium", "Large"],
+            value="Medium"
+        )
+        
+        # Card style
+        card_style = st.selectbox(
+            "Flashcard Style",
+            ["Default", "Minimal", "Colorful", "Professional"]
+        )
+    
+    with col2:
+        st.subheader("Study Preferences")
+        
+        # Default test length
+        default_test_length = st.slider(
+            "Default Test Length",
+            min_value=5,
+            max_value=30,
+            value=10,
+            step=5
+        )
+        
+        # Auto-advance cards
+        auto_advance = st.toggle("Auto-advance flashcards", value=False)
+        if auto_advance:
+            advance_speed = st.slider("Advance every (seconds)", 2, 10, 5)
+        
+        # Show hints
+        show_hints = st.toggle("Show hints in tests", value=True)
+    
+    st.subheader("Data Management")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Export data
+        if st.button("📤 Export Progress Data", use_container_width=True):
+            # Create export data
+            export_data = {
+                "progress": st.session_state.progress.to_dict(),
+                "test_results": [record.to_result(vocab_index) for record in get_test_results()],
+                "score": st.session_state.score,
+                "total_questions": st.session_state.total_questions,
+                "scheduler": st.session_state.scheduler.to_dict(),
+                "deck": vocab_index.fingerprint,
+                "export_date": datetime.now().isoformat()
+            }
+            
+            # Convert to JSON
+            json_data = json.dumps(export_data, indent=2)
+            
+            # Create download button
+            st.download_button(
+                label="Download Progress Data",
+                data=json_data,
+                file_name="gre_vocab_progress.json",
+                mime="application/json",
+                use_container_width=True
+            )
+    
+    with col2:
+        # Import data
+        uploaded_file = st.file_uploader("Import progress data", type=['json'])
+        if uploaded_file is not None:
+            try:
+                import_data = json.load(uploaded_file)
+                st.success("Data loaded successfully! Click below to import.")
+                
+                # Review cards are stored by word id, so a schedule only fits the deck it was exported from
+                scheduler_data = import_data.get("scheduler")
+                scheduler_fits = scheduler_data is None or (
+                    scheduler_data.get("n_words") == vocab_index.total_words
+                    and import_data.get("deck", vocab_index.fingerprint) == vocab_index.fingerprint
+                )
+                if not scheduler_fits:
+                    st.error("The review schedule in this file was exported from a different word list and will not be imported.")
+                
+                if st.button("📥 Import Progress Data", use_container_width=True, type="primary"):
+                    # Update session state with imported data
+                    user_id = st.session_state.user_id
+                    if "progress" in import_data:
+                        for group, data in import_data["progress"].items():
+                            if group in vocab_index.group_position:
+                                st.session_state.progress.load_group(vocab_index.group_position[group], data)
+                                save_group_progress(group)
+                    if "test_results" in import_data:
+                        # Results already in the history (e.g. from importing the same file twice) are skipped
+                        test_results = get_test_results()
+                        known = {tuple(record.summary().items()) for record in test_results}
+                        for result in import_data["test_results"]:
+                            record = TestRecord.from_result(result, vocab_index)
+                            key = tuple(record.summary().items())
+                            if key not in known:
+                                known.add(key)
+                                test_results.append(record)
+                                progress_store.record_test(user_id, record)
+                    if "score" in import_data:
+                        st.session_state.score = import_data["score"]
+                    if "total_questions" in import_data:
+                        st.session_state.total_questions = import_data["total_questions"]
+                    progress_store.save_totals(user_id, st.session_state.score, st.session_state.total_questions)
+                    if scheduler_data is not None and scheduler_fits:
+                        st.session_state.scheduler = ReviewScheduler.from_dict(scheduler_data)
+                        progress_store.save_scheduler(user_id, scheduler_data)
+                    progress_store.flush()
+                    
+                    st.success("Progress data imported successfully!")
+                    st.rerun()
+            except:
+                st.error("Error importing data. Please check the file format.")
+    
+    st.subheader("About")
+    st.write("**GRE Vocabulary Master**")
+    st.write("Version: 1.0.0")
+    st.write("Total words in database:", vocab_index.total_words)
+    st.write("Number of groups:", vocab_index.n_groups)
+    st.write("Created with ❤️ using Streamlit")
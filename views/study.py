@@ -0,0 +1,368 @@
+"""Study Mode: flashcards, word list, pronunciation, search and spaced review."""
+
+import html
+import time
+from datetime import datetime
+
+import streamlit as st
+from core.events import AnswerEvent
+from core.scheduler import GRADES
+from views.common import (
+    get_search_index, log_answer_events, progress_store, render_suggestions, rerun_fragment,
+    save_group_progress, timed, vocab_index
+)
+from views.deck import client_deck
+
+
+def card_html(word_data, show_meaning):
+    meaning = f'<div class="meaning-display">{word_data["meaning"]}</div>' if show_meaning else ''
+    return (
+        '<div class="flashcard">'
+        f'<div class="word-display">{word_data["word"]}</div>'
+        f'<div class="simple-def">{word_data["simple"]}</div>'
+        f'{meaning}</div>'
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def group_cards(group):
+    """``(front, back)`` markup for every card in ``group``, rendered once per process."""
+    return tuple((card_html(w, False), card_html(w, True)) for w in vocab_index.group_records[group])
+
+
+@st.cache_resource(show_spinner=False, max_entries=256)
+def deck_rows(group):
+    """``(word, simple, meaning)`` rows of ``group`` for the browser deck."""
+    return tuple((w["word"], w["simple"], w["meaning"]) for w in vocab_index.group_records[group])
+
+
+def sync_deck(batch):
+    """Apply a batch of card views from the browser deck, once."""
+    if not batch or batch == st.session_state.get('deck_batch'):
+        return
+    st.session_state.deck_batch = batch
+    group = batch["group"]
+    if group not in vocab_index.group_position:
+        return
+    if st.session_state.progress.view_card(vocab_index.group_position[group], batch["reached"]):
+        save_group_progress(group)
+    # Keep the server deck where the browser left off
+    if group == st.session_state.current_group:
+        st.session_state.flashcard_index = batch["index"]
+        st.session_state.show_meaning = batch["showing"]
+
+
+def button_deck(current_group, g):
+    """Server-side flashcards: every button press reruns the fragment."""
+    idx = st.session_state.flashcard_index % len(current_group)
+
+    # Update cards viewed
+    if st.session_state.progress.view_card(g, st.session_state.flashcard_index):
+        save_group_progress(st.session_state.current_group)
+
+    # Flashcard
+    st.markdown(group_cards(st.session_state.current_group)[idx][st.session_state.show_meaning], unsafe_allow_html=True)
+
+    # Card controls
+    col_btns = st.columns(5)
+
+    with col_btns[0]:
+        if st.button("⏮️", help="First card", use_container_width=True):
+            st.session_state.flashcard_index = 0
+            st.session_state.show_meaning = False
+            rerun_fragment()
+
+    with col_btns[1]:
+        if st.button("◀️", help="Previous card", use_container_width=True):
+            st.session_state.flashcard_index = max(0, st.session_state.flashcard_index - 1)
+            st.session_state.show_meaning = False
+            rerun_fragment()
+
+    with col_btns[2]:
+        btn_text = "👁️ Show" if not st.session_state.show_meaning else "🙈 Hide"
+        if st.button(btn_text, help="Show/Hide meaning", use_container_width=True):
+            st.session_state.show_meaning = not st.session_state.show_meaning
+            rerun_fragment()
+
+    with col_btns[3]:
+        if st.button("▶️", help="Next card", use_container_width=True):
+            st.session_state.flashcard_index += 1
+            st.session_state.show_meaning = False
+            rerun_fragment()
+
+    with col_btns[4]:
+        if st.button("⏭️", help="Last card", use_container_width=True):
+            st.session_state.flashcard_index = len(current_group) - 1
+            st.session_state.show_meaning = False
+            rerun_fragment()
+
+    # Progress
+    progress = ((idx) + 1) / len(current_group)
+    st.progress(progress)
+    st.caption(f"Card {idx + 1} of {len(current_group)}")
+
+
+@st.fragment
+@timed("study.flashcards")
+def flashcard_deck():
+    """Flashcards for the current group; card navigation reruns only this fragment."""
+    current_group = vocab_index.group_records[st.session_state.current_group]
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+
+    with col2:
+        if current_group:
+            g = vocab_index.group_position[st.session_state.current_group]
+            
+            # Flip and page in the browser, syncing progress every few cards
+            if st.toggle("⚡ Instant cards", value=True, key="client_deck",
+                         help="Flip through cards without waiting for the server; progress is saved every few cards"):
+                batch = client_deck(
+                    st.session_state.current_group, deck_rows(st.session_state.current_group),
+                    start=st.session_state.flashcard_index, key="client_deck_view"
+                )
+                sync_deck(batch)
+            else:
+                button_deck(current_group, g)
+
+            # Mark as studied
+            if not st.session_state.progress.studied[g]:
+                if st.button("✅ Mark This Group as Studied", use_container_width=True):
+                    st.session_state.progress.mark_studied(g)
+                    save_group_progress(st.session_state.current_group)
+                    st.success(f"Great! You've completed studying {st.session_state.current_group}")
+                    st.rerun()
+    progress_store.flush()
+
+
+@st.fragment
+@timed("study.review")
+def review_deck():
+    """Spaced-repetition review; grading a card reruns only this fragment."""
+    st.subheader("Review Due Cards")
+    st.caption("Spaced repetition across all groups: grade each card and it comes back just before you'd forget it.")
+
+    scheduler = st.session_state.scheduler
+    word_id = scheduler.next_card()
+
+    if word_id is None:
+        next_due = scheduler.next_due_time()
+        st.success("🎉 You're all caught up!")
+        if next_due:
+            st.info(f"Next review due {datetime.fromtimestamp(next_due).strftime('%Y-%m-%d %H:%M')}.")
+    else:
+        group = vocab_index.group_names[vocab_index.word_group_ids[word_id]]
+        started = st.session_state.get('review_started')
+        if not started or started[0] != word_id:
+            st.session_state.review_started = (word_id, time.perf_counter_ns())
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            card = word_id - vocab_index.group_offsets[vocab_index.word_group_ids[word_id]]
+            st.markdown(group_cards(group)[card][st.session_state.review_show_meaning], unsafe_allow_html=True)
+            card_status = "New card" if scheduler.due[word_id] == 0 else f"Streak: {scheduler.reps[word_id]}"
+            st.caption(f"{group} • {card_status}")
+
+            if not st.session_state.review_show_meaning:
+                if st.button("👁️ Show Answer", use_container_width=True, key="review_show"):
+                    st.session_state.review_show_meaning = True
+                    rerun_fragment()
+            else:
+                grade_cols = st.columns(len(GRADES))
+                for col, (label, grade) in zip(grade_cols, GRADES.items()):
+                    with col:
+                        if st.button(label, use_container_width=True, key=f"review_{label}"):
+                            scheduler.review(word_id, grade)
+                            started = st.session_state.get('review_started')
+                            latency_ms = (time.perf_counter_ns() - started[1]) // 1_000_000 if started and started[0] == word_id else 0
+                            log_answer_events([AnswerEvent(word_id, grade >= 3, latency_ms, time.time())])
+                            progress_store.save_scheduler(st.session_state.user_id, scheduler.to_dict())
+                            st.session_state.review_show_meaning = False
+                            rerun_fragment()
+
+    st.caption(f"Total reviews: {scheduler.reviews}")
+    progress_store.flush()
+
+
+# Words per Word List page; only the visible page is ever rendered
+WORD_LIST_PAGE_SIZE = 25
+# Matches listed by the cross-group search; the rest are only counted
+GLOBAL_SEARCH_ROWS = 50
+WORD_ACTIONS = {
+    "📌 Save": "Save word for review",
+    "🎧 Hear": "Listen to pronunciation",
+    "📝 Example": "See example sentence",
+}
+
+
+def word_table(word_ids, first):
+    """One page of the word list as a single HTML table, numbered from ``first``."""
+    rows = "".join(
+        f"<tr><td>{first + i}</td><td><b>{html.escape(record['word'])}</b></td>"
+        f"<td>{html.escape(record['simple'])}</td><td>{html.escape(record['meaning'])}</td></tr>"
+        for i, record in enumerate(vocab_index.records[word_id] for word_id in word_ids)
+    )
+    return (
+        "<div class='progress-table'><table>"
+        "<thead><tr><th>#</th><th>Word</th><th>Simple Definition</th><th>Meaning</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table></div>"
+    )
+
+
+def word_action(action, word_data):
+    """Handle a row action for the selected word."""
+    if action == "📌 Save":
+        st.toast(f"Saved '{word_data['word']}' for later review!")
+    elif action == "🎧 Hear":
+        st.toast(f"Pronunciation for '{word_data['word']}' (audio would play here)")
+    elif action == "📝 Example":
+        st.info(f"Example: He used '{word_data['word']}' in his speech effectively.")
+
+
+@st.fragment
+@timed("study.word_list")
+def paged_word_list():
+    """Paginated word list for the group or the whole deck; paging reruns only this fragment."""
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search_term = st.text_input("🔍 Search words:", "", key="word_list_search")
+    with col2:
+        scope = st.radio("Show:", ["This group", "All groups"], key="word_list_scope")
+    
+    group = st.session_state.current_group if scope == "This group" else None
+    st.subheader(f"Word List - {group or 'All Groups'}")
+    
+    # Matching word ids; without a search term the scope is a range, so
+    # paging through the whole deck never materializes it
+    if search_term:
+        word_ids = get_search_index().search(search_term, group=group)
+    elif group is not None:
+        word_ids = vocab_index.group_range(group)
+    else:
+        word_ids = range(vocab_index.total_words)
+    
+    # Back to the first page whenever the list itself changes
+    view = (group, search_term)
+    if st.session_state.get('word_list_view') != view:
+        st.session_state.word_list_view = view
+        st.session_state.word_list_page = 0
+    n_pages = max(1, -(-len(word_ids) // WORD_LIST_PAGE_SIZE))
+    page = min(st.session_state.word_list_page, n_pages - 1)
+    first = page * WORD_LIST_PAGE_SIZE
+    visible = word_ids[first:first + WORD_LIST_PAGE_SIZE]
+    
+    if visible:
+        st.markdown(word_table(visible, first + 1), unsafe_allow_html=True)
+    
+    nav = st.columns([1, 2, 1])
+    with nav[0]:
+        if st.button("⬅️ Previous", key="word_list_prev", disabled=page == 0, use_container_width=True):
+            st.session_state.word_list_page = page - 1
+            rerun_fragment()
+    with nav[1]:
+        if visible:
+            st.caption(f"Page {page + 1} of {n_pages} • words {first + 1}–{first + len(visible)} of {len(word_ids)}")
+    with nav[2]:
+        if st.button("Next ➡️", key="word_list_next", disabled=page >= n_pages - 1, use_container_width=True):
+            st.session_state.word_list_page = page + 1
+            rerun_fragment()
+    
+    # One set of actions for the selected row instead of buttons on every word
+    if visible:
+        labels = [f"{first + i}. {vocab_index.words[word_id]}" for i, word_id in enumerate(visible, 1)]
+        selected = st.selectbox("Selected word:", labels, key="word_list_selected")
+        word_data = vocab_index.records[visible[labels.index(selected)]]
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Simple Definition:**")
+            st.info(word_data['simple'])
+        with col2:
+            st.write("**Meaning:**")
+            st.success(word_data['meaning'])
+        
+        action_cols = st.columns(len(WORD_ACTIONS))
+        clicked = None
+        for col, (action, help_text) in zip(action_cols, WORD_ACTIONS.items()):
+            with col:
+                if st.button(action, key=f"word_list_{action}", help=help_text, use_container_width=True):
+                    clicked = action
+        if clicked:
+            word_action(clicked, word_data)
+    
+    if search_term and not word_ids:
+        render_suggestions(search_term)
+    
+    st.metric("Words Found", len(word_ids))
+
+
+def render():
+    st.markdown("<h1 class='main-header'>📖 Study Mode</h1>", unsafe_allow_html=True)
+    
+    current_group = vocab_index.group_records[st.session_state.current_group]
+    search_index = get_search_index()
+    
+    # Study mode tabs
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(
+        ["🎴 Flashcards", "📋 Word List", "🔊 Pronunciation", "🌐 Search All Groups", "🔁 Review Due Cards"]
+    )
+    
+    with tab1:
+        flashcard_deck()
+    
+    with tab2:
+        paged_word_list()
+    
+    with tab3:
+        st.subheader("Pronunciation Guide")
+        st.info("🔊 Select a word to hear its pronunciation")
+        
+        word_list = vocab_index.group_words[st.session_state.current_group]
+        selected_word = st.selectbox("Choose a word:", word_list)
+        
+        if selected_word:
+            word_data = current_group[word_list.index(selected_word)]
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown(f"### {selected_word}")
+                st.write(f"**Definition:** {word_data['simple']}")
+                st.write(f"**Meaning:** {word_data['meaning']}")
+            
+            with col2:
+                st.markdown("### 🔊 Pronunciation")
+                st.write("(Audio player would appear here)")
+                st.write("**Phonetic Spelling:** /əˈbaʊnd/")
+                st.write("**Syllables:** a-bound")
+                
+                if st.button("▶️ Play Pronunciation", use_container_width=True):
+                    st.toast(f"Playing pronunciation for '{selected_word}'")
+    
+    with tab4:
+        st.subheader("Search All Groups")
+        
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            global_term = st.text_input("🔍 Search every group:", "", key="global_search")
+        with col2:
+            match_mode = st.radio("Match:", ["Anywhere", "Word starts with"], key="global_search_mode")
+        
+        if global_term:
+            # Only the rows shown are listed; the total is counted separately
+            if match_mode == "Anywhere":
+                hits = search_index.search(global_term, limit=GLOBAL_SEARCH_ROWS)
+                n_found = search_index.count(global_term)
+            else:
+                hits = search_index.prefix(global_term, limit=GLOBAL_SEARCH_ROWS)
+                n_found = search_index.prefix_count(global_term)
+            
+            st.metric("Words Found", n_found)
+            for word_id in hits:
+                word_data = vocab_index.records[word_id]
+                group = vocab_index.group_names[vocab_index.word_group_ids[word_id]]
+                st.markdown(f"**{word_data['word']}** · {group} — {word_data['simple']} ({word_data['meaning']})")
+            if n_found > len(hits):
+                st.caption(f"Showing the first {len(hits)} of {n_found} matches. Refine your search to narrow it down.")
+            
+            render_suggestions(global_term, exclude=set(hits))
+    
+    with tab5:
+        review_deck()